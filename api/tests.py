@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Category, Post
+
+
+class PostListAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create_user(email='author@example.com', password='password')
+        inactive = User.objects.create_user(email='inactive@example.com', password='password', is_active=False)
+        cls.news, cls.tech = Category.objects.bulk_create(Category(name=name) for name in ('News', 'Tech'))
+        start = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+        # Posts 2 and 3 share a timestamp, so pages must break the tie by id.
+        times = [start, start + timedelta(hours=1), start + timedelta(hours=2), start + timedelta(hours=2), start + timedelta(hours=3)]
+        cls.posts = [
+            cls.create_post(f'Post {i}', cls.news if i % 2 else cls.tech, cls.author, created_at)
+            for i, created_at in enumerate(times)
+        ]
+        cls.create_post('Hidden', cls.news, inactive, start)
+        cls.newest_first = [post.pk for post in sorted(cls.posts, key=lambda post: (post.created_at, post.pk), reverse=True)]
+        cls.url = reverse('api:post-list')
+
+    @staticmethod
+    def create_post(title, category, author, created_at):
+        with mock.patch('django.utils.timezone.now', return_value=created_at):
+            return Post.objects.create(title=title, content='Lorem ipsum', category=category, author=author)
+
+    def test_fields(self):
+        response = self.client.get(self.url, {'fields': 'title,category_name', 'limit': 1})
+        self.assertEqual(response.json()['results'], [{'title': 'Post 4', 'category_name': 'Tech'}])
+        post = self.client.get(self.url, {'limit': 1}).json()['results'][0]
+        self.assertEqual(
+            set(post),
+            {'id', 'title', 'content', 'created_at', 'modified_at', 'category', 'category_name', 'author', 'image'},
+        )
+        self.assertIsNone(post['image'])
+
+    def test_cursor_paging(self):
+        ids, url, data = [], self.url, {'limit': 2}
+        while url:
+            page = self.client.get(url, data).json()
+            ids += [post['id'] for post in page['results']]
+            url, data = page['next'], None
+        self.assertEqual(ids, self.newest_first)
+
+    def test_filters(self):
+        response = self.client.get(self.url, {'category': self.news.pk, 'fields': 'id'})
+        self.assertEqual([post['id'] for post in response.json()['results']], [self.posts[3].pk, self.posts[1].pk])
+
+    def test_stream(self):
+        response = self.client.get(self.url, {'stream': 1, 'fields': 'id'})
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([post['id'] for post in data['results']], self.newest_first)
+
+    def test_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': response['ETag']}).status_code, 304)
+        Post.objects.filter(pk=self.posts[-1].pk).update(title='Changed')
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': response['ETag']}).status_code, 200)
+
+    def test_bad_requests(self):
+        for params, error in (
+            ({'fields': 'title,secret'}, 'Unknown fields: secret.'),
+            ({'limit': 'ten'}, 'limit must be an integer.'),
+            ({'category': 'news'}, 'category must be an id.'),
+            ({'category': '\u00b2'}, 'category must be an id.'),
+            ({'author': '\u00b2'}, 'author must be an id.'),
+            ({'author': str(10**30)}, 'author must be an id.'),
+            ({'cursor': 'garbage'}, 'Invalid cursor.'),
+            ({'cursor': f'{10**30}-1'}, 'Invalid cursor.'),
+            ({'cursor': f'0-{10**30}'}, 'Invalid cursor.'),
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': error})
+        for cursor in ('garbage', '\u00b2', '-1', str(10**30)):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('api:category-list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_detail(self):
+        post = self.posts[0]
+        response = self.client.get(reverse('api:post-detail', args=[post.pk]), {'fields': 'id,title'})
+        self.assertEqual(response.json(), {'id': post.pk, 'title': 'Post 0'})
+        hidden = Post.objects.get(title='Hidden')
+        self.assertEqual(self.client.get(reverse('api:post-detail', args=[hidden.pk])).status_code, 404)
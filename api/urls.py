@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+urlpatterns = [
+    path('posts/', views.PostListAPI.as_view(), name='post-list'),
+    path('posts/<int:pk>/', views.PostDetailAPI.as_view(), name='post-detail'),
+    path('categories/', views.CategoryListAPI.as_view(), name='category-list'),
+    path('categories/<int:pk>/', views.CategoryDetailAPI.as_view(), name='category-detail'),
+    path('users/', views.UserListAPI.as_view(), name='user-list'),
+    path('users/<int:pk>/', views.UserDetailAPI.as_view(), name='user-detail'),
+]
@@ -0,0 +1,249 @@
+import hashlib
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import View
+
+from posts.models import Category, Post
+from posts.pagination import after_cursor, decode_cursor, encode_cursor
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+STREAM_CHUNK_SIZE = 2000
+# The largest value of a 64-bit id column.
+MAX_ID = 2**63 - 1
+
+
+class APIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_id(value, message):
+    """
+    Returns `value` as an id, or raises APIError(message) if it is not an
+    integer in the range of a database id.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise APIError(message)
+    if not 0 <= number <= MAX_ID:
+        raise APIError(message)
+    return number
+
+
+class ValuesAPIView(View):
+    """
+    Base class for the read-only JSON endpoints.
+
+    Rows are read with .values() and serialized as they come out of the
+    database, without building model instances. `fields` maps the public
+    field names to a model field or an expression; `?fields=a,b` selects only
+    those columns.
+
+    Responses carry an ETag and answer If-None-Match with 304.
+    """
+    http_method_names = ['get', 'head', 'options']
+    queryset = None
+    fields = {}
+    file_fields = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except APIError as error:
+            return JsonResponse({'error': str(error)}, status=error.status)
+
+    def get_field_names(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+        names = [name for name in requested.split(',') if name]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise APIError(f"Unknown fields: {', '.join(unknown)}.")
+        return names
+
+    def select(self, queryset, names):
+        names = list(dict.fromkeys(names))
+        columns = [self.fields[name] for name in names if isinstance(self.fields[name], str)]
+        expressions = {name: self.fields[name] for name in names if not isinstance(self.fields[name], str)}
+        return queryset.values(*columns, **expressions)
+
+    def serialize(self, row, names):
+        result = {name: row[name] for name in names}
+        for name in self.file_fields:
+            if name in result:
+                result[name] = default_storage.url(result[name]) if result[name] else None
+        return result
+
+    def json_response(self, data):
+        body = json.dumps(data, cls=DjangoJSONEncoder).encode()
+        response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+        return get_conditional_response(self.request, etag=response['ETag'], response=response)
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            raise APIError('limit must be an integer.')
+        return max(1, min(limit, MAX_LIMIT))
+
+    def next_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return self.request.build_absolute_uri(f'{self.request.path}?{query.urlencode()}')
+
+
+class ValuesDetailView(ValuesAPIView):
+    def get(self, request, pk):
+        names = self.get_field_names()
+        row = self.select(self.queryset.filter(pk=pk), names).first()
+        if row is None:
+            raise APIError('Not found.', status=404)
+        return self.json_response(self.serialize(row, names))
+
+
+class ValuesListView(ValuesAPIView):
+    """
+    Lists rows in primary key order with keyset pagination (`?cursor=` is the
+    last id of the previous page).
+    """
+    filters = {}
+    stream_ordering = ['id']
+
+    def get_queryset(self):
+        queryset = self.queryset
+        for param, lookup in self.filters.items():
+            value = self.request.GET.get(param)
+            if value is not None:
+                queryset = queryset.filter(**{lookup: parse_id(value, f'{param} must be an id.')})
+        return queryset
+
+    def paginate(self, queryset, names, cursor, limit):
+        queryset = self.select(queryset, names + ['id']).order_by('id')
+        if cursor:
+            queryset = queryset.filter(pk__gt=parse_id(cursor, 'Invalid cursor.'))
+        rows = list(queryset[:limit + 1])
+        next_cursor = str(rows[limit - 1]['id']) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def get(self, request):
+        names = self.get_field_names()
+        queryset = self.get_queryset()
+        if request.GET.get('stream'):
+            return self.stream(queryset, names)
+        rows, next_cursor = self.paginate(queryset, names, request.GET.get('cursor'), self.get_limit())
+        return self.json_response({
+            'results': [self.serialize(row, names) for row in rows],
+            'next': self.next_url(next_cursor),
+        })
+
+    def stream(self, queryset, names):
+        """
+        Streams every matching row as one JSON document, reading the database
+        in chunks, for clients that want the whole collection at once.
+        """
+        rows = self.select(queryset, names).order_by(*self.stream_ordering).iterator(chunk_size=STREAM_CHUNK_SIZE)
+        encoder = DjangoJSONEncoder()
+
+        def chunks():
+            yield '{"results": ['
+            for i, row in enumerate(rows):
+                yield (',' if i else '') + encoder.encode(self.serialize(row, names))
+            yield ']}'
+
+        return StreamingHttpResponse(chunks(), content_type='application/json')
+
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'content': 'content',
+    'created_at': 'created_at',
+    'modified_at': 'modified_at',
+    'category': 'category',
+    'category_name': F('category__name'),
+    'author': 'author',
+    'image': 'image',
+}
+
+
+class PostListAPI(ValuesListView):
+    """
+    Posts, newest first. Filter with `?category=<id>` or `?author=<id>`.
+    Posts of deactivated accounts and hidden categories are left out.
+    """
+    queryset = Post.objects.visible()
+    fields = POST_FIELDS
+    file_fields = ['image']
+    filters = {'category': 'category', 'author': 'author'}
+    stream_ordering = ['-created_at', '-id']
+
+    def paginate(self, queryset, names, cursor, limit):
+        if cursor:
+            position = decode_cursor(cursor)
+            if position is None or not 0 <= position[1] <= MAX_ID:
+                raise APIError('Invalid cursor.')
+        # Keyset on (created_at, id), served by the created_at index.
+        rows = list(after_cursor(self.select(queryset, names + ['id', 'created_at']), cursor)[:limit + 1])
+        if len(rows) <= limit:
+            return rows, None
+        last = rows[limit - 1]
+        return rows[:limit], encode_cursor(last['created_at'], last['id'])
+
+
+class PostDetailAPI(ValuesDetailView):
+    queryset = Post.objects.visible()
+    fields = POST_FIELDS
+    file_fields = ['image']
+
+
+CATEGORY_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'created_at': 'created_at',
+}
+
+
+class CategoryListAPI(ValuesListView):
+    queryset = Category.objects.filter(is_active=True)
+    fields = CATEGORY_FIELDS
+
+
+class CategoryDetailAPI(ValuesDetailView):
+    queryset = Category.objects.filter(is_active=True)
+    fields = CATEGORY_FIELDS
+
+
+USER_FIELDS = {
+    'id': 'id',
+    'username': 'username',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'avatar': 'avatar',
+    'date_joined': 'date_joined',
+}
+
+
+class UserListAPI(ValuesListView):
+    queryset = get_user_model().objects.filter(is_active=True)
+    fields = USER_FIELDS
+    file_fields = ['avatar']
+
+
+class UserDetailAPI(ValuesDetailView):
+    queryset = get_user_model().objects.filter(is_active=True)
+    fields = USER_FIELDS
+    file_fields = ['avatar']
@@ -0,0 +1,86 @@
+"""
+The JSON API against the HTML views serving the same posts.
+
+Usage:
+    python benchmarks/bench_api.py [--posts 5000] [--repeat 10]
+
+Runs against a throwaway SQLite database seeded with --posts posts.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog.settings")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("MEDIA_BACKEND", "local")
+
+
+def seed(posts):
+    from django.core.management import call_command
+
+    from posts.models import Category, Post
+    from users.models import User
+
+    call_command("migrate", verbosity=0)
+    authors = [
+        User.objects.create_user(email=f"author{i}@example.com", password="x", first_name=f"first{i}", last_name=f"last{i}")
+        for i in range(20)
+    ]
+    category = Category.objects.create(name="benchmark")
+    Post.objects.bulk_create(
+        Post(title=f"Post number {i}", content="Lorem ipsum dolor sit amet. " * 20, category=category, author=authors[i % 20])
+        for i in range(posts)
+    )
+    return category
+
+
+def timed(client, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (url, response.status_code)
+    return min(timings), statistics.median(timings), len(body)
+
+
+def run(posts, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        import django
+        from django.conf import settings
+
+        settings.DATABASES["default"]["NAME"] = str(Path(directory) / "bench.sqlite3")
+        django.setup()
+
+        from django.test import Client
+
+        category = seed(posts)
+        client = Client(HTTP_HOST="127.0.0.1")
+        cases = [
+            ("HTML all posts", "/posts/all"),
+            ("API all posts, streamed", "/api/posts/?stream=1"),
+            ("API all posts, 3 fields, streamed", "/api/posts/?stream=1&fields=id,title,created_at"),
+            ("HTML category", f"/posts/category/{category.pk}/"),
+            ("API category posts, first page", f"/api/posts/?category={category.pk}&limit=100"),
+            ("API first page, 3 fields", "/api/posts/?limit=100&fields=id,title,created_at"),
+        ]
+        print(f"{posts} posts, best/median of {repeat} requests")
+        print(f"{'case':40}{'best ms':>10}{'median ms':>11}{'bytes':>11}")
+        for name, url in cases:
+            best, median, size = timed(client, url, repeat)
+            print(f"{name:40}{best:10.1f}{median:11.1f}{size:11d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    run(args.posts, args.repeat)
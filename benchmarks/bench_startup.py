@@ -0,0 +1,130 @@
+"""
+Startup cost of a fresh process: time to import and set up Django up to a
+ready WSGI application, then the latency of its first response.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--path /posts/] [--warmup]
+                                       [--max-startup-ms N] [--max-first-response-ms N]
+
+Each run is a new interpreter against a throwaway SQLite database. The
+script exits with status 1 when a limit is exceeded or when the Cloudinary
+SDK gets imported during startup, which should only happen on first use of
+the media storage.
+
+With --warmup, blog.warmup.warm_up() runs between startup and the first
+request, as it does in a pre-fork master with WARMUP_ON_LOAD; its duration
+is reported as warmup_ms.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def child(database, path, migrate, warmup):
+    start = time.perf_counter()
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = database
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+
+        call_command("migrate", verbosity=0)
+        return
+
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import get_resolver
+
+    application = get_wsgi_application()
+    get_resolver().url_patterns
+    ready = time.perf_counter()
+    startup_modules = set(sys.modules)
+    if warmup:
+        from blog.warmup import warm_up
+
+        warm_up(application)
+    warmed = time.perf_counter()
+
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "127.0.0.1",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "127.0.0.1",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": sys.stdin.buffer,
+        "wsgi.errors": sys.stderr,
+    }
+    statuses = []
+    b"".join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+    done = time.perf_counter()
+
+    print(json.dumps({
+        "startup_ms": (ready - start) * 1000,
+        "warmup_ms": (warmed - ready) * 1000,
+        "first_response_ms": (done - warmed) * 1000,
+        "status": statuses[0],
+        "modules": len(startup_modules),
+        "cloudinary_at_startup": any(name.split(".")[0] == "cloudinary" for name in startup_modules),
+    }))
+
+
+def run_child(*args):
+    return subprocess.run(
+        [sys.executable, __file__, "--child", *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / "bench.sqlite3")
+        run_child(database, args.path, "--migrate")
+        results = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = json.loads(run_child(database, args.path, *(["--warmup"] if args.warmup else [])))
+            result["process_ms"] = (time.perf_counter() - start) * 1000
+            results.append(result)
+
+    print(f"{args.runs} runs of GET {args.path} ({results[0]['status']}), {results[0]['modules']} modules at startup")
+    for key in ("startup_ms", "warmup_ms", "first_response_ms", "process_ms"):
+        values = [result[key] for result in results]
+        print(f"{key:20} best {min(values):8.1f}   median {statistics.median(values):8.1f}")
+
+    failures = []
+    if any(result["cloudinary_at_startup"] for result in results):
+        failures.append("cloudinary was imported during startup")
+    for key, limit in (("startup_ms", args.max_startup_ms), ("first_response_ms", args.max_first_response_ms)):
+        median = statistics.median(result[key] for result in results)
+        if limit is not None and median > limit:
+            failures.append(f"median {key} {median:.1f} exceeds {limit}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2], sys.argv[3], migrate="--migrate" in sys.argv[4:], warmup="--warmup" in sys.argv[4:])
+        sys.exit(0)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/posts/")
+    parser.add_argument("--warmup", action="store_true", help="Run blog.warmup.warm_up() before the first request.")
+    parser.add_argument("--max-startup-ms", type=float)
+    parser.add_argument("--max-first-response-ms", type=float)
+    sys.exit(main(parser.parse_args()))
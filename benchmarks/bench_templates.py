@@ -0,0 +1,111 @@
+"""
+Render time of the list templates under the Django and Jinja2 engines.
+
+Usage:
+    python benchmarks/bench_templates.py [--rows 1000] [--repeat 20]
+
+The posts are built in memory, so no database is needed and only template
+rendering (including URL reversal and filters) is measured.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog.settings")
+for var in ("SECRET_KEY", "CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+    os.environ.setdefault(var, "benchmark")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.jinja2 import Jinja2
+from django.test import RequestFactory
+from django.utils import timezone
+
+from posts.models import Category, Post
+from users.models import User
+
+TEMPLATES = [
+    "posts/post_list.html",
+    "posts/post_component.html",
+    "posts/category_detail.html",
+    "users/profile.html",
+]
+
+
+def build_engines():
+    django_params = next(
+        t for t in settings.TEMPLATES if t["BACKEND"].endswith("DjangoTemplates")
+    )
+    django_params = {k: v for k, v in django_params.items() if k != "BACKEND"}
+    django_engine = DjangoTemplates({**django_params, "NAME": "django"})
+    jinja_engine = Jinja2(
+        {
+            "NAME": "jinja2",
+            "DIRS": [BASE_DIR / "jinja2"],
+            "APP_DIRS": True,
+            "OPTIONS": {"environment": "blog.jinja2.environment"},
+        }
+    )
+    return {"django": django_engine, "jinja2": jinja_engine}
+
+
+def build_context(rows):
+    now = timezone.now()
+    category = Category(pk=1, name="benchmark", created_at=now)
+    authors = [
+        User(pk=i, email=f"author{i}@example.com", first_name=f"first {i}", last_name=f"last {i}", date_joined=now)
+        for i in range(1, 51)
+    ]
+    posts = []
+    for i in range(1, rows + 1):
+        post = Post(
+            pk=i,
+            title=f"Post number {i}",
+            content="Lorem ipsum dolor sit amet. " * 8,
+            created_at=now - timedelta(hours=i),
+            modified_at=now,
+        )
+        post.category = category
+        post.author = authors[i % len(authors)]
+        posts.append(post)
+    return {"posts": posts, "category": category, "user": authors[0]}
+
+
+def run(rows, repeat):
+    context = build_context(rows)
+    request = RequestFactory().get("/")
+    request.user = context["user"]
+    engines = build_engines()
+
+    print(f"{rows} rows, best/median of {repeat} renders (ms)")
+    print(f"{'template':32}" + "".join(f"{name:>20}" for name in engines))
+    for template_name in TEMPLATES:
+        cells = []
+        for engine in engines.values():
+            template = engine.get_template(template_name)
+            template.render(dict(context), request)  # warm up loaders and caches
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                template.render(dict(context), request)
+                timings.append((time.perf_counter() - start) * 1000)
+            cells.append(f"{min(timings):9.1f} /{statistics.median(timings):8.1f}")
+        print(f"{template_name:32}" + "".join(f"{cell:>20}" for cell in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,82 @@
+"""
+Jinja2 environment for the optional Jinja2 template backend.
+
+Enabled with TEMPLATE_ENGINE=jinja2 (see blog/settings.py). Only the templates
+that have a copy under a `jinja2/` directory are rendered by Jinja2, every
+other template falls back to the Django engine.
+"""
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.template import defaultfilters
+from django.templatetags.static import static
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.timezone import template_localtime
+from jinja2 import Environment, FileSystemBytecodeCache
+
+# Same characters reverse() leaves unquoted in path arguments.
+URL_SAFE_CHARS = "!$&'()*+,;=/~:@"
+URL_PLACEHOLDER = 7391046285
+
+
+@lru_cache(maxsize=None)
+def _url_parts(urlconf, script_prefix, viewname, nargs):
+    """
+    Reverses `viewname` once with placeholder arguments and splits the result
+    around them, so later calls only have to join strings.
+    """
+    placeholders = [str(URL_PLACEHOLDER + i) for i in range(nargs)]
+    path = reverse(viewname, urlconf=urlconf, args=placeholders)
+    parts = []
+    for placeholder in placeholders:
+        head, path = path.split(placeholder, 1)
+        parts.append(head)
+    parts.append(path)
+    return tuple(parts)
+
+
+def url(viewname, *args):
+    """
+    Fast replacement for the {% url %} tag.
+
+    The resolver is only consulted the first time a view name is seen with a
+    given number of positional arguments. Arguments are not checked against
+    the path converters, so pass the same values you would pass to reverse().
+    """
+    # The URLconf is part of the key: a request can set its own, and tests
+    # can override ROOT_URLCONF.
+    parts = _url_parts(get_urlconf(settings.ROOT_URLCONF), get_script_prefix(), viewname, len(args))
+    bits = [parts[0]]
+    for arg, part in zip(args, parts[1:]):
+        bits.append(quote(str(arg), safe=URL_SAFE_CHARS))
+        bits.append(part)
+    return "".join(bits)
+
+
+def date(value, arg=None):
+    """
+    The Django `date` filter, converting to the current time zone first like
+    the Django engine does for every variable it renders.
+    """
+    return defaultfilters.date(template_localtime(value), arg)
+
+
+def environment(**options):
+    # Compiled templates are kept in memory by the environment (cache_size)
+    # and on disk by the bytecode cache, so new workers skip the compile step.
+    options.setdefault("bytecode_cache", FileSystemBytecodeCache())
+    env = Environment(**options)
+    env.globals.update(
+        {
+            "url": url,
+            "static": static,
+        }
+    )
+    env.filters.update(
+        {
+            "date": date,
+            "title": defaultfilters.title,
+        }
+    )
+    return env
@@ -0,0 +1,40 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+def estimate_row_count(model, using='default'):
+    """
+    Returns a cheap estimate of the number of rows in the model's table.
+
+    PostgreSQL keeps one in its statistics; elsewhere the highest primary key
+    (read from the end of the primary key index) is used as an upper bound.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return int(row[0])
+    return model._default_manager.using(using).aggregate(estimate=Max('pk'))['estimate'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that skips COUNT(*) on large, unfiltered tables.
+
+    Meant for admin changelists, together with show_full_result_count = False.
+    Filtered querysets are still counted exactly.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query') and not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate > self.estimate_threshold:
+                return estimate
+        return super().count
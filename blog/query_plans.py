@@ -0,0 +1,62 @@
+"""
+Test helpers that check how the database executes a queryset.
+
+Only SQLite plans are inspected; on other databases the assertions are
+skipped.
+"""
+import re
+
+from django.db import connections
+
+# EXPLAIN QUERY PLAN lines for a table read without an index ("SCAN posts_post",
+# "SCAN TABLE posts_post" before SQLite 3.36) and for rows sorted or grouped
+# after they were read.
+FULL_SCAN_RE = re.compile(r'\bSCAN (?:TABLE )?(\w+)$')
+TEMP_B_TREE_RE = re.compile(r'\bUSE TEMP B-TREE FOR (.+)$')
+
+
+def query_plan(queryset):
+    """
+    Returns the detail column of EXPLAIN QUERY PLAN for the queryset, one
+    string per step.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan):
+    """
+    Returns a description of every full table scan and temporary B-tree in
+    the plan.
+    """
+    problems = []
+    for step in plan:
+        if match := FULL_SCAN_RE.search(step):
+            problems.append(f'full scan of {match[1]}')
+        elif match := TEMP_B_TREE_RE.search(step):
+            problems.append(f'temp B-tree for {match[1].lower()}')
+    return problems
+
+
+class QueryPlanTestMixin:
+    """
+    Adds assertIndexed() to a TestCase. Seed enough rows and run ANALYZE in
+    setUpTestData() so the planner sees realistic table sizes.
+    """
+
+    @staticmethod
+    def analyze(using='default'):
+        with connections[using].cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertIndexed(self, queryset):
+        if connections[queryset.db].vendor != 'sqlite':
+            self.skipTest('Query plans are only checked on SQLite.')
+        plan = query_plan(queryset)
+        problems = plan_problems(plan)
+        if problems:
+            self.fail(
+                f"{', '.join(problems)} in\n{queryset.query}\nPlan:\n" + '\n'.join(f'  {step}' for step in plan)
+            )
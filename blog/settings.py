@@ -13,9 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 
 from decouple import config
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
+from django.core.exceptions import ImproperlyConfigured
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +45,7 @@ INSTALLED_APPS = [
     # my apps
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
+    'profiler.apps.ProfilerConfig',
 ]
 
 MIDDLEWARE = [
@@ -55,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'profiler.middleware.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -79,8 +79,37 @@ TEMPLATES = [
     },
 ]
 
+# Set TEMPLATE_ENGINE=jinja2 to render the post list, category and profile
+# pages with Jinja2. Templates without a copy under a `jinja2/` directory
+# are still rendered by the Django engine.
+TEMPLATE_ENGINE = config('TEMPLATE_ENGINE', default='django')
+
+if TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.insert(0, {
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [
+            BASE_DIR / 'jinja2'
+        ],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'environment': 'blog.jinja2.environment',
+        },
+    })
+
+# Number of request profiles kept by profiler.middleware.ProfilerMiddleware.
+PROFILER_MAX_CAPTURES = 50
+
 WSGI_APPLICATION = 'blog.wsgi.application'
 
+# Set WARMUP_ON_LOAD=True to run blog.warmup.warm_up() when blog.wsgi is
+# imported. With gunicorn --preload, or uWSGI without lazy-apps, that happens
+# once in the master process before the workers are forked.
+WARMUP_ON_LOAD = config('WARMUP_ON_LOAD', default=False, cast=bool)
+
+# Pages requested during the warm-up. The home page fills the tag cloud cache.
+# Keep them cheap: the warm-up delays the start of every worker.
+WARMUP_PATHS = ['/posts/', '/posts/categories/']
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -129,6 +158,39 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Media files (post images and avatars)
+# MEDIA_BACKEND is 'cloudinary', or 'local' to keep uploads under MEDIA_ROOT.
+
+MEDIA_BACKEND = config('MEDIA_BACKEND', default='cloudinary')
+
+MEDIA_STORAGE_BACKENDS = {
+    'cloudinary': 'blog.storage.CloudinaryStorage',
+    'local': 'django.core.files.storage.FileSystemStorage',
+}
+if MEDIA_BACKEND not in MEDIA_STORAGE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"MEDIA_BACKEND must be one of {', '.join(map(repr, MEDIA_STORAGE_BACKENDS))}, not {MEDIA_BACKEND!r}."
+    )
+
+STORAGES = {
+    'default': {
+        'BACKEND': MEDIA_STORAGE_BACKENDS[MEDIA_BACKEND],
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_URL = 'media/'
+
+# Only read when the Cloudinary backend is first used, see blog/storage.py.
+CLOUDINARY = {
+    'cloud_name': config('CLOUDINARY_CLOUD_NAME', default=''),
+    'api_key': config('CLOUDINARY_API_KEY', default=''),
+    'api_secret': config('CLOUDINARY_API_SECRET', default=''),
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -136,9 +198,3 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
 LOGIN_URL = 'users:login'
-
-cloudinary.config(
-    cloud_name = config('CLOUDINARY_CLOUD_NAME'),
-    api_key = config('CLOUDINARY_API_KEY'),
-    api_secret = config('CLOUDINARY_API_SECRET')
-)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Media storage backends.
+
+The backend is picked with the MEDIA_BACKEND setting (see blog/settings.py):
+Cloudinary in production, or Django's FileSystemStorage for local files.
+"""
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+# Stored names use the format of cloudinary.models.CloudinaryField, so values
+# saved before the switch to this storage keep working unchanged.
+NAME_RE = re.compile(
+    r"(?:(?P<resource_type>image|raw|video)/(?P<type>upload|private|authenticated)/)?"
+    r"(?:v(?P<version>\d+)/)?(?P<public_id>.*?)(\.(?P<format>[^.]+))?$"
+)
+
+
+@deconstructible
+class CloudinaryStorage(Storage):
+    """
+    Stores uploads on Cloudinary.
+
+    The cloudinary package is imported and configured from settings.CLOUDINARY
+    the first time a file is saved, deleted or linked to, so processes that
+    never touch media do not pay for it.
+    """
+
+    @cached_property
+    def cloudinary(self):
+        options = getattr(settings, "CLOUDINARY", {})
+        missing = [key for key in ("cloud_name", "api_key", "api_secret") if not options.get(key)]
+        if missing:
+            raise ImproperlyConfigured(f"CLOUDINARY is missing {', '.join(missing)}.")
+
+        import cloudinary
+        import cloudinary.uploader
+        import cloudinary.utils
+
+        cloudinary.config(**options)
+        return cloudinary
+
+    def _parse(self, name):
+        match = NAME_RE.match(name)
+        return {
+            "public_id": match.group("public_id"),
+            "resource_type": match.group("resource_type") or "image",
+            "type": match.group("type") or "upload",
+            "version": match.group("version"),
+            "format": match.group("format"),
+        }
+
+    def _save(self, name, content):
+        if hasattr(content, "seekable") and content.seekable():
+            content.seek(0)
+        result = self.cloudinary.uploader.upload(
+            content, folder=posixpath.dirname(name) or None, resource_type="auto"
+        )
+        name = f"{result['resource_type']}/{result['type']}/v{result['version']}/{result['public_id']}"
+        if result.get("format"):
+            name += f".{result['format']}"
+        return name
+
+    def get_available_name(self, name, max_length=None):
+        # Cloudinary assigns unique public ids itself.
+        return name
+
+    def exists(self, name):
+        return False
+
+    def delete(self, name):
+        resource = self._parse(name)
+        self.cloudinary.uploader.destroy(
+            resource["public_id"], resource_type=resource["resource_type"], type=resource["type"]
+        )
+
+    def url(self, name):
+        resource = self._parse(name)
+        public_id = resource.pop("public_id")
+        url, _ = self.cloudinary.utils.cloudinary_url(public_id, secure=True, **resource)
+        return url
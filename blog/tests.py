@@ -0,0 +1,69 @@
+import importlib
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import include, path, set_urlconf
+
+from blog import wsgi
+from blog.jinja2 import url
+from blog.storage import NAME_RE, CloudinaryStorage
+
+# URLconf used by JinjaUrlTests, with the posts URLs under another prefix.
+urlpatterns = [
+    path('elsewhere/', include('posts.urls')),
+    path('users/', include('users.urls')),
+]
+
+
+class JinjaUrlTests(SimpleTestCase):
+    def test_matches_reverse(self):
+        self.assertEqual(url('posts:home'), '/posts/')
+        self.assertEqual(url('posts:post-detail', 42), '/posts/post/42/')
+        self.assertEqual(url('posts:tag-detail', 'a b+c'), '/posts/tag/a%20b+c/')
+
+    def test_follows_request_urlconf(self):
+        self.assertEqual(url('posts:post-detail', 1), '/posts/post/1/')
+        set_urlconf('blog.tests')
+        try:
+            self.assertEqual(url('posts:post-detail', 1), '/elsewhere/post/1/')
+        finally:
+            set_urlconf(None)
+        self.assertEqual(url('posts:post-detail', 1), '/posts/post/1/')
+
+    @override_settings(ROOT_URLCONF='blog.tests')
+    def test_follows_root_urlconf_setting(self):
+        self.assertEqual(url('posts:post-detail', 1), '/elsewhere/post/1/')
+
+
+@override_settings(CLOUDINARY={'cloud_name': 'demo', 'api_key': 'key', 'api_secret': 'secret'})
+class CloudinaryStorageTests(SimpleTestCase):
+    # A name saved by cloudinary.models.CloudinaryField before the switch.
+    LEGACY_NAME = 'image/upload/v123/folder/id.jpg'
+
+    def test_parses_legacy_name(self):
+        match = NAME_RE.match(self.LEGACY_NAME)
+        self.assertEqual(
+            match.group('resource_type', 'type', 'version', 'public_id', 'format'),
+            ('image', 'upload', '123', 'folder/id', 'jpg'),
+        )
+
+    def test_parses_bare_public_id(self):
+        self.assertEqual(
+            CloudinaryStorage()._parse('folder/id'),
+            {'public_id': 'folder/id', 'resource_type': 'image', 'type': 'upload', 'version': None, 'format': None},
+        )
+
+    def test_url_round_trip(self):
+        self.assertEqual(
+            CloudinaryStorage().url(self.LEGACY_NAME),
+            f'https://res.cloudinary.com/demo/{self.LEGACY_NAME}',
+        )
+
+
+class WsgiTests(SimpleTestCase):
+    @override_settings(WARMUP_ON_LOAD=True)
+    def test_failed_warm_up_is_logged(self):
+        with mock.patch('blog.warmup.warm_up', side_effect=RuntimeError('boom')) as warm_up:
+            with self.assertLogs('blog.wsgi', 'ERROR'):
+                importlib.reload(wsgi)
+        warm_up.assert_called_once_with(wsgi.application)
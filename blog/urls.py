@@ -14,6 +14,8 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
@@ -21,5 +23,9 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('posts/', include('posts.urls'), name='posts'),
     path('users/', include('users.urls'), name='users'),
+    path('api/', include('api.urls'), name='api'),
 ]
 
+# Serves uploads in development when MEDIA_BACKEND is 'local'.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
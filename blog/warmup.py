@@ -0,0 +1,107 @@
+"""
+Warm-up of a freshly started process, so the first requests a worker serves
+don't pay for the lazy initialization of URL resolvers, templates, database
+connections and caches.
+
+Run it in the server's master process before it forks the workers (see
+WARMUP_ON_LOAD in blog.settings): the workers inherit everything loaded here.
+"""
+import os
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+
+def populate_url_resolvers():
+    """
+    Imports every URLconf and builds the reverse and namespace lookup tables
+    of the root resolver and all included ones. Returns the namespaces.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return sorted(resolver.namespace_dict)
+
+
+def compile_templates():
+    """
+    Compiles every template of every engine into the engine's template cache.
+    Returns the number compiled and the names that failed to compile.
+    """
+    compiled, failed = 0, []
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for root, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    name = os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+                    try:
+                        engine.get_template(name)
+                    except (TemplateSyntaxError, UnicodeDecodeError):
+                        failed.append(f'{engine.name}:{name}')
+                    else:
+                        compiled += 1
+    return compiled, failed
+
+
+def open_connections():
+    """
+    Connects to every configured database. Returns the aliases.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+    return [connection.alias for connection in connections.all()]
+
+
+def _allowed_host():
+    return next((host for host in settings.ALLOWED_HOSTS if host and host[0] not in '.*'), 'localhost')
+
+
+def warm_requests(application, paths):
+    """
+    Serves a GET request for each of `paths` through `application`, which
+    runs the middleware, the views' queries and template rendering once and
+    fills the caches the pages use. Returns the response status of each path.
+    """
+    statuses = {}
+    for path in paths:
+        environ = {'PATH_INFO': path, 'HTTP_HOST': _allowed_host()}
+        setup_testing_defaults(environ)
+        response = application(environ, lambda status, headers, exc_info=None: statuses.__setitem__(path, status))
+        try:
+            b''.join(response)
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+    return statuses
+
+
+def warm_up(application=None, paths=None, close_connections=True):
+    """
+    Runs every warm-up step and returns a list of (step, milliseconds, result).
+
+    Database connections are closed at the end unless `close_connections` is
+    False: a connection opened before forking must not be shared by the
+    workers.
+    """
+    application = application or WSGIHandler()
+    paths = settings.WARMUP_PATHS if paths is None else paths
+    steps = [
+        ('url resolvers', populate_url_resolvers),
+        ('templates', compile_templates),
+        ('database connections', open_connections),
+        ('requests', lambda: warm_requests(application, paths)),
+    ]
+    results = []
+    try:
+        for step, function in steps:
+            start = time.perf_counter()
+            result = function()
+            results.append((step, (time.perf_counter() - start) * 1000, result))
+    finally:
+        if close_connections:
+            connections.close_all()
+    return results
@@ -7,10 +7,22 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog.settings')
 
 application = get_wsgi_application()
+
+if settings.WARMUP_ON_LOAD:
+    from blog.warmup import warm_up
+
+    # A failed warm-up only costs the first requests their speed; the server
+    # must still start.
+    try:
+        warm_up(application)
+    except Exception:
+        logging.getLogger(__name__).exception('Warm-up failed.')
@@ -1,6 +1,87 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
+from django.template.response import TemplateResponse
 
-from .models import Post, Category
+from blog.pagination import EstimatedCountPaginator
 
-admin.site.register(Post)
-admin.site.register(Category)
+from .archive import move_posts
+from .deletion import delete_posts_and_images
+from .models import Post, Category, Tag
+from .search import search_posts
+
+# Titles listed on the confirmation page of the delete_posts action.
+DELETE_CONFIRMATION_SAMPLE = 20
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.filter(is_active=True), required=False, label='Move to'
+    )
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = ['title', 'category', 'author', 'created_at']
+    list_select_related = ['category', 'author']
+    list_filter = ['category', ('author', admin.RelatedOnlyFieldListFilter), 'created_at']
+    # Answered by the full-text index, see get_search_results().
+    search_fields = ['title']
+    search_help_text = 'Search titles and content.'
+    autocomplete_fields = ['author', 'category', 'tags']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = PostActionForm
+    actions = ['move_to_category', 'delete_posts']
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_posts(queryset, search_term), False
+
+    def get_actions(self, request):
+        # Replaced by delete_posts, which does not load every selected post.
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description='Move selected posts to category', permissions=['change'])
+    def move_to_category(self, request, queryset):
+        category = Category.objects.filter(is_active=True, pk=request.POST.get('category') or None).first()
+        if category is None:
+            self.message_user(request, 'Choose a category to move the posts to.', messages.WARNING)
+            return
+        moved = move_posts(queryset, category)
+        self.message_user(request, f'Moved {moved} posts.', messages.SUCCESS)
+
+    @admin.action(description='Delete selected posts', permissions=['delete'])
+    def delete_posts(self, request, queryset):
+        if not request.POST.get('post'):
+            # Asks first, like the delete_selected action it replaces. The
+            # form posts the same selection back with post=yes.
+            return TemplateResponse(request, 'admin/posts/post/delete_posts_confirmation.html', {
+                **self.admin_site.each_context(request),
+                'title': 'Are you sure?',
+                'opts': self.model._meta,
+                'count': queryset.count(),
+                'sample': queryset.order_by('-created_at')[:DELETE_CONFIRMATION_SAMPLE],
+                'selected': request.POST.getlist(ACTION_CHECKBOX_NAME),
+                'select_across': request.POST.get('select_across', '0'),
+                'action_checkbox_name': ACTION_CHECKBOX_NAME,
+            })
+        deleted = delete_posts_and_images(queryset.values_list('pk', flat=True))
+        self.message_user(request, f'Deleted {deleted} posts.', messages.SUCCESS)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'is_active', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['name']
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'post_count']
+    ordering = ['-post_count']
+    search_fields = ['name']
+    prepopulated_fields = {'slug': ['name']}
+    readonly_fields = ['post_count']
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .models import ArchiveMonth, Post
+
+
+def adjust_archive_month(category_id, created_at, delta):
+    """
+    Adds `delta` to the post count of the category's month containing `created_at`.
+    """
+    created_at = timezone.localtime(created_at)
+    _adjust_month(category_id, created_at.year, created_at.month, delta)
+
+
+def _adjust_month(category_id, year, month, delta):
+    lookup = {'category_id': category_id, 'year': year, 'month': month}
+    updated = ArchiveMonth.objects.filter(**lookup).update(post_count=F('post_count') + delta)
+    if not updated:
+        _, created = ArchiveMonth.objects.get_or_create(**lookup, defaults={'post_count': delta})
+        if not created:
+            # Lost a race with another writer creating the same row.
+            ArchiveMonth.objects.filter(**lookup).update(post_count=F('post_count') + delta)
+
+
+def _month_counts(queryset):
+    return (
+        queryset.annotate(year=ExtractYear('created_at'), month=ExtractMonth('created_at'))
+        .values('category', 'year', 'month')
+        .annotate(post_count=Count('pk'))
+        .order_by()
+    )
+
+
+def move_posts(queryset, category, batch_size=500):
+    """
+    Moves the posts of `queryset` to `category` with one UPDATE per batch,
+    adjusting the rollup from an aggregate of each batch instead of per post.
+    Returns the number of posts moved.
+    """
+    pks = list(queryset.exclude(category=category).values_list('pk', flat=True))
+    for start in range(0, len(pks), batch_size):
+        batch = Post.objects.filter(pk__in=pks[start:start + batch_size])
+        with transaction.atomic():
+            for row in _month_counts(batch):
+                _adjust_month(row['category'], row['year'], row['month'], -row['post_count'])
+                _adjust_month(category.pk, row['year'], row['month'], row['post_count'])
+            batch.update(category=category)
+    return len(pks)
+
+
+def remove_posts_from_archive(queryset):
+    """
+    Subtracts the posts of `queryset` from the rollup, for callers deleting
+    them without going through the post_delete signal.
+    """
+    for row in _month_counts(queryset):
+        _adjust_month(row['category'], row['year'], row['month'], -row['post_count'])
+
+
+def rebuild_archive():
+    """
+    Recomputes every ArchiveMonth row from Post with a single aggregate.
+    """
+    rows = _month_counts(Post.objects.all())
+    with transaction.atomic():
+        ArchiveMonth.objects.all().delete()
+        ArchiveMonth.objects.bulk_create(
+            ArchiveMonth(category_id=row['category'], year=row['year'], month=row['month'], post_count=row['post_count'])
+            for row in rows
+        )
+        return ArchiveMonth.objects.count()
+
+
+def get_archive_months():
+    """
+    Returns the months that have posts, newest first, as dicts with year,
+    month, date (the first of the month) and post_count.
+    """
+    months = (
+        ArchiveMonth.objects.values('year', 'month')
+        .annotate(total=Sum('post_count'))
+        .filter(total__gt=0)
+        .order_by('-year', '-month')
+    )
+    return [
+        {'year': row['year'], 'month': row['month'], 'date': date(row['year'], row['month'], 1), 'post_count': row['total']}
+        for row in months
+    ]
+
+
+def month_range(year, month=None):
+    """
+    Returns the aware [start, end) datetimes of a year, or of a month of it.
+    """
+    if month is None:
+        start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    elif month == 12:
+        start, end = datetime(year, 12, 1), datetime(year + 1, 1, 1)
+    else:
+        start, end = datetime(year, month, 1), datetime(year, month + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
@@ -0,0 +1,164 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import Follow
+
+from .archive import remove_posts_from_archive
+from .models import Category, DeletionJob, Post, PostTag, RelatedPost
+from .tags import recount_tags
+
+DELETION_BATCH_SIZE = 100
+
+
+def schedule_user_deletion(user):
+    """
+    Deactivates `user` right away and queues the account for deletion.
+    """
+    with transaction.atomic():
+        get_user_model().objects.filter(pk=user.pk).update(is_active=False)
+        job, _ = DeletionJob.objects.get_or_create(kind=DeletionJob.USER, object_id=user.pk)
+    return job
+
+
+def schedule_category_deletion(category):
+    """
+    Hides `category` right away and queues it, with its posts, for deletion.
+    """
+    with transaction.atomic():
+        Category.objects.filter(pk=category.pk).update(is_active=False)
+        job, _ = DeletionJob.objects.get_or_create(kind=DeletionJob.CATEGORY, object_id=category.pk)
+    return job
+
+
+def destroy_image(name):
+    """
+    Removes an uploaded image from the media storage. Missing images are
+    ignored, so retrying a batch after a crash is harmless.
+    """
+    if name:
+        default_storage.delete(name)
+
+
+def _delete_post_dependents(pks):
+    """
+    Applies the on_delete of every relation pointing at Post to the rows that
+    reference the posts `pks`, like the deletion collector would.
+    """
+    # The relations the collector looks at, including hidden ones
+    # (related_name='+') and those of auto-created many-to-many tables.
+    relations = [
+        field for field in Post._meta.get_fields(include_hidden=True)
+        if field.auto_created and not field.concrete and (field.one_to_one or field.one_to_many)
+    ]
+    for relation in relations:
+        model = relation.related_model
+        field_name = relation.field.name
+        on_delete = relation.on_delete
+        dependents = model._base_manager.filter(**{f'{field_name}__in': pks})
+        if on_delete is models.CASCADE:
+            # Goes through the collector for the dependents' own relations.
+            dependents.delete()
+        elif on_delete is models.SET_NULL:
+            dependents.update(**{field_name: None})
+        elif on_delete in (models.PROTECT, models.RESTRICT):
+            if dependents.exists():
+                raise models.ProtectedError(
+                    f'Posts are referenced through {model.__name__}.{field_name}.', set(dependents)
+                )
+        elif on_delete is not models.DO_NOTHING:
+            raise ValueError(f'{model.__name__}.{field_name}: on_delete={on_delete.__name__} is not supported.')
+
+
+def bulk_delete_posts(pks, batch_size=DELETION_BATCH_SIZE):
+    """
+    Deletes the posts with primary keys `pks` using a few set-based DELETE
+    statements per batch. Posts are not loaded and no signals are sent, so the
+    tag counters and the archive rollup are updated here instead.
+
+    Uploaded images are left alone; see delete_posts_and_images(). Returns
+    the number of posts deleted.
+    """
+    pks = list(pks)
+    deleted = 0
+    for start in range(0, len(pks), batch_size):
+        batch = pks[start:start + batch_size]
+        posts = Post.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            tag_ids = set(PostTag.objects.filter(post__in=batch).values_list('tag', flat=True))
+            remove_posts_from_archive(posts)
+            # See signals.mark_related_posts_stale().
+            Post.objects.filter(
+                pk__in=RelatedPost.objects.filter(related__in=batch).values('post')
+            ).exclude(pk__in=batch).update(related_computed_at=None)
+            _delete_post_dependents(batch)
+            # Nothing references these posts any more, so skip the deletion
+            # collector (which would load every post to send its signals).
+            deleted += posts._raw_delete(posts.db)
+            recount_tags(tag_ids)
+    return deleted
+
+
+def delete_posts_and_images(pks, batch_size=DELETION_BATCH_SIZE):
+    """
+    Like bulk_delete_posts(), and also removes the posts' uploaded images,
+    batch by batch like delete_next_batch(). Returns the number of posts
+    deleted.
+    """
+    pks = list(pks)
+    deleted = 0
+    for start in range(0, len(pks), batch_size):
+        batch = list(Post.objects.filter(pk__in=pks[start:start + batch_size]).values_list('pk', 'image'))
+        for _, image in batch:
+            destroy_image(image)
+        deleted += bulk_delete_posts([pk for pk, _ in batch], batch_size)
+    return deleted
+
+
+def _job_target(job):
+    if job.kind == DeletionJob.USER:
+        return get_user_model().objects.filter(pk=job.object_id), Post.objects.filter(author_id=job.object_id)
+    return Category.objects.filter(pk=job.object_id), Post.objects.filter(category_id=job.object_id)
+
+
+def delete_next_batch(job, batch_size=DELETION_BATCH_SIZE):
+    """
+    Deletes the next batch of the job's posts, or the target itself once no
+    posts are left. Returns False when the job is finished.
+    """
+    target, posts = _job_target(job)
+    batch = list(posts.order_by('pk').values_list('pk', 'image')[:batch_size])
+    if batch:
+        # Images go first: if the worker dies before the rows are deleted the
+        # batch is retried, and destroying an already removed image is a no-op.
+        for _, image in batch:
+            destroy_image(image)
+        with transaction.atomic():
+            bulk_delete_posts([pk for pk, _ in batch], batch_size)
+            DeletionJob.objects.filter(pk=job.pk).update(posts_deleted=F('posts_deleted') + len(batch))
+        job.posts_deleted += len(batch)
+        return True
+
+    if job.kind == DeletionJob.USER:
+        for avatar in target.values_list('avatar', flat=True):
+            destroy_image(avatar)
+    with transaction.atomic():
+        if job.kind == DeletionJob.USER:
+            # The user's follows are deleted with it.
+            get_user_model().objects.filter(
+                pk__in=Follow.objects.filter(follower_id=job.object_id).values('author')
+            ).update(follower_count=F('follower_count') - 1)
+        target.delete()
+        job.finished_at = timezone.now()
+        job.save(update_fields=['finished_at'])
+    return False
+
+
+def run_deletion_job(job, batch_size=DELETION_BATCH_SIZE):
+    """
+    Works through a deletion job until it is finished.
+    """
+    while delete_next_batch(job, batch_size):
+        pass
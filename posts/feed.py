@@ -0,0 +1,165 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from users.models import Follow
+
+from .models import FanOutJob, Post, TimelineEntry
+from .pagination import after_cursor, encode_cursor
+
+FAN_OUT_BATCH_SIZE = 1000
+# Once an author has more followers than this, their new posts are no longer
+# copied to each follower's timeline; feed_page() reads them from the posts
+# table instead. See User.is_pull_author.
+PULL_FOLLOWER_THRESHOLD = 10000
+# Recent posts of an author copied to a timeline when its owner follows them.
+BACKFILL_POSTS = 50
+# Entries kept per timeline by the trim_timelines command. Pushed posts older
+# than the newest ones drop out of the feed; posts of pull authors are read
+# from the posts table and stay.
+TIMELINE_LENGTH = 1000
+
+
+def is_pull_author(author):
+    return author.is_pull_author
+
+
+def follow(follower, author):
+    """
+    Makes `follower` follow `author` and copies the author's recent posts to
+    the follower's timeline. Returns False if nothing changed.
+    """
+    if follower.pk == author.pk:
+        return False
+    with transaction.atomic():
+        _, created = Follow.objects.get_or_create(follower=follower, author=author)
+        if not created:
+            return False
+        authors = get_user_model().objects.filter(pk=author.pk)
+        authors.update(follower_count=F('follower_count') + 1)
+        authors.filter(follower_count__gt=PULL_FOLLOWER_THRESHOLD, is_pull_author=False).update(is_pull_author=True)
+        author.refresh_from_db(fields=['follower_count', 'is_pull_author'])
+        if not is_pull_author(author):
+            recent = Post.objects.filter(author=author).order_by('-created_at').values_list('pk', 'created_at')
+            TimelineEntry.objects.bulk_create(
+                [TimelineEntry(user=follower, post_id=pk, created_at=created_at) for pk, created_at in recent[:BACKFILL_POSTS]],
+                ignore_conflicts=True,
+            )
+    return True
+
+
+def unfollow(follower, author):
+    """
+    Stops `follower` following `author` and removes the author's posts from
+    the follower's timeline. Returns False if nothing changed.
+    """
+    with transaction.atomic():
+        deleted, _ = Follow.objects.filter(follower=follower, author=author).delete()
+        if not deleted:
+            return False
+        get_user_model().objects.filter(pk=author.pk).update(follower_count=F('follower_count') - 1)
+        TimelineEntry.objects.filter(user=follower, post__author=author).delete()
+    return True
+
+
+def timelines_over_length():
+    """
+    Returns the ids of the users with more than TIMELINE_LENGTH timeline
+    entries. Reads the whole timeline index, so call it periodically, not on
+    every write.
+    """
+    return (
+        TimelineEntry.objects.values('user_id')
+        .annotate(entries=Count('pk'))
+        .filter(entries__gt=TIMELINE_LENGTH)
+        .values_list('user_id', flat=True)
+    )
+
+
+def trim_timelines(user_ids):
+    """
+    Deletes the entries of the users' timelines older than their
+    TIMELINE_LENGTH-th newest one. Returns the number of entries deleted.
+    """
+    deleted = 0
+    for user_id in user_ids:
+        timeline = TimelineEntry.objects.filter(user_id=user_id)
+        # The last entry kept, found on the timeline index.
+        last = list(after_cursor(timeline.values_list('created_at', 'post_id'), pk='post_id')[TIMELINE_LENGTH - 1:TIMELINE_LENGTH])
+        if last:
+            deleted += after_cursor(timeline, encode_cursor(*last[0]), pk='post_id').delete()[0]
+    return deleted
+
+
+def schedule_fan_out(post):
+    """
+    Queues a new post for its author's followers' timelines, unless it has no
+    followers or is read through the pull path.
+    """
+    author = post.author
+    if author.follower_count and not is_pull_author(author):
+        FanOutJob.objects.get_or_create(post=post)
+
+
+def fan_out_next_batch(job, batch_size=FAN_OUT_BATCH_SIZE):
+    """
+    Copies the job's post to the timelines of the next `batch_size` followers.
+    Returns False when the job is finished.
+
+    Followers who follow the author after their batch was written get the post
+    from the backfill in follow(), so none are missed.
+    """
+    post = job.post
+    followers = list(
+        Follow.objects.filter(author_id=post.author_id, follower_id__gt=job.last_follower_id)
+        .order_by('follower_id')
+        .values_list('follower_id', flat=True)[:batch_size]
+    )
+    with transaction.atomic():
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(user_id=user_id, post_id=post.pk, created_at=post.created_at) for user_id in followers],
+            ignore_conflicts=True,
+        )
+        if followers:
+            job.last_follower_id = followers[-1]
+        if len(followers) < batch_size:
+            job.finished_at = timezone.now()
+        job.save(update_fields=['last_follower_id', 'finished_at'])
+    return job.finished_at is None
+
+
+def run_fan_out_job(job, batch_size=FAN_OUT_BATCH_SIZE):
+    """
+    Works through a fan-out job until it is finished.
+    """
+    while fan_out_next_batch(job, batch_size):
+        pass
+
+
+def feed_page(user, cursor=None, per_page=20):
+    """
+    Returns one page of the posts by the authors `user` follows, newest first,
+    and the cursor of the next page (None on the last page).
+
+    Pushed posts are read from the user's timeline, posts of followed pull
+    authors from the posts table. Each source is read up to one page past the
+    cursor and the results are merged.
+    """
+    timeline = TimelineEntry.objects.filter(user=user).values_list('created_at', 'post_id')
+    positions = set(after_cursor(timeline, cursor, pk='post_id')[:per_page + 1])
+
+    pull_authors = list(
+        Follow.objects.filter(follower=user, author__is_pull_author=True)
+        .values_list('author_id', flat=True)
+    )
+    for author_id in pull_authors:
+        # One range of the (author, created_at, id) index per author; a
+        # single author__in query would have to sort the union.
+        pulled = Post.objects.filter(author_id=author_id).values_list('created_at', 'pk')
+        positions.update(after_cursor(pulled, cursor)[:per_page + 1])
+
+    positions = sorted(positions, reverse=True)
+    next_cursor = encode_cursor(*positions[per_page - 1]) if len(positions) > per_page else None
+    posts = Post.objects.visible().select_related('author').in_bulk([pk for _, pk in positions[:per_page]])
+    return [posts[pk] for _, pk in positions[:per_page] if pk in posts], next_cursor
@@ -0,0 +1,118 @@
+import re
+from collections import Counter
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from scipy import sparse
+
+from posts.models import Post, RelatedPost
+
+TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def tfidf_matrix(documents):
+    """
+    Builds an L2-normalized TF-IDF matrix (one row per document) using
+    sublinear term frequencies and smoothed inverse document frequencies.
+    """
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    data = []
+    for document in documents:
+        for term, count in Counter(tokenize(document)).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(count)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), indices, indptr),
+        shape=(len(documents), len(vocabulary)),
+    )
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    matrix.data = 1 + np.log(matrix.data)
+    matrix = matrix @ sparse.diags(idf)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix)
+
+
+def top_neighbours(matrix, rows, top_k):
+    """
+    Yields (row, [(neighbour_row, score), ...]) for each of `rows`, with the
+    `top_k` most cosine-similar other rows of `matrix`.
+
+    The scores stay sparse: only the rows that share a term with the post
+    are stored and ranked, never a dense len(rows) x len(matrix) array.
+    """
+    scores = sparse.csr_matrix(matrix[rows] @ matrix.T)
+    for i, row in enumerate(rows):
+        start, end = scores.indptr[i], scores.indptr[i + 1]
+        columns, values = scores.indices[start:end], scores.data[start:end]
+        keep = (columns != row) & (values > 0)
+        columns, values = columns[keep], values[keep]
+        k = min(top_k, len(values))
+        if k <= 0:
+            yield row, []
+            continue
+        best = np.argpartition(-values, k - 1)[:k] if k < len(values) else np.arange(len(values))
+        best = best[np.argsort(-values[best], kind="stable")]
+        yield row, [(int(columns[j]), float(values[j])) for j in best]
+
+
+class Command(BaseCommand):
+    help = "Computes the related posts shown on the post detail page."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=5, help="Related posts to keep per post.")
+        parser.add_argument("--batch-size", type=int, default=256, help="Posts scored per batch.")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every post instead of only new or edited ones and those that lost a related post.",
+        )
+
+    def handle(self, *args, **options):
+        # Edits made while the command runs make their posts stale again.
+        started = timezone.now()
+        posts = list(Post.objects.order_by("pk").values_list("pk", "title", "content"))
+        if not posts:
+            self.stdout.write("No posts.")
+            return
+
+        pks = [pk for pk, _, _ in posts]
+        # The title is repeated so that it weighs more than the body.
+        matrix = tfidf_matrix([f"{title} {title} {content}" for _, title, content in posts])
+
+        stale = Post.objects.all()
+        if not options["all"]:
+            stale = stale.filter(
+                Q(related_computed_at__isnull=True) | Q(modified_at__gt=F("related_computed_at"))
+            )
+        stale_pks = set(stale.values_list("pk", flat=True))
+        rows = np.array([i for i, pk in enumerate(pks) if pk in stale_pks], dtype=np.intp)
+
+        batch_size = options["batch_size"]
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            related = [
+                RelatedPost(post_id=pks[row], related_id=pks[neighbour], rank=rank, score=score)
+                for row, neighbours in top_neighbours(matrix, batch, options["top_k"])
+                for rank, (neighbour, score) in enumerate(neighbours)
+            ]
+            batch_pks = [pks[row] for row in batch]
+            with transaction.atomic():
+                RelatedPost.objects.filter(post_id__in=batch_pks).delete()
+                RelatedPost.objects.bulk_create(related)
+                Post.objects.filter(pk__in=batch_pks).update(related_computed_at=started)
+
+        self.stdout.write(self.style.SUCCESS(f"Computed related posts for {len(rows)} of {len(pks)} posts."))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.deletion import DELETION_BATCH_SIZE, run_deletion_job
+from posts.models import DeletionJob
+
+
+class Command(BaseCommand):
+    help = "Deletes the user accounts and categories queued for deletion, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DELETION_BATCH_SIZE, help="Posts deleted per transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs instead of exiting.")
+        parser.add_argument("--interval", type=float, default=10, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            for job in DeletionJob.objects.filter(finished_at__isnull=True).order_by("pk"):
+                run_deletion_job(job, options["batch_size"])
+                self.stdout.write(f"{job}: {job.posts_deleted} posts deleted.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.feed import FAN_OUT_BATCH_SIZE, run_fan_out_job
+from posts.models import FanOutJob
+
+
+class Command(BaseCommand):
+    help = "Copies new posts to their authors' followers' timelines, in batches, and deletes the finished jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=FAN_OUT_BATCH_SIZE, help="Timelines written per transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs instead of exiting.")
+        parser.add_argument("--interval", type=float, default=2, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            for job in FanOutJob.objects.filter(finished_at__isnull=True).select_related("post").order_by("pk"):
+                run_fan_out_job(job, options["batch_size"])
+                self.stdout.write(f"{job}: done.")
+            # Also clears jobs finished by a run that stopped before this point.
+            FanOutJob.objects.filter(finished_at__isnull=False).delete()
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import rebuild_archive
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-month post counts used by the archive pages."
+
+    def handle(self, *args, **options):
+        rows = rebuild_archive()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} archive months."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from posts.feed import TIMELINE_LENGTH, timelines_over_length, trim_timelines
+
+
+class Command(BaseCommand):
+    help = f"Deletes the timeline entries past the newest {TIMELINE_LENGTH} of each user. Run it periodically."
+
+    def handle(self, *args, **options):
+        users = list(timelines_over_length())
+        deleted = trim_timelines(users)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} entries from {len(users)} timelines."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads URL resolvers and templates, connects to the databases and requests the main pages, "
+        "as done before forking with WARMUP_ON_LOAD. Run on its own it fills the shared state: the "
+        "database's and the Jinja2 bytecode caches, and the cache backend if it is not per process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Pages to request instead of WARMUP_PATHS.")
+
+    def handle(self, *args, **options):
+        total = 0
+        for step, milliseconds, result in warm_up(paths=options["paths"] or None):
+            total += milliseconds
+            self.stdout.write(f"{step:22} {milliseconds:8.1f} ms  {self.describe(step, result)}")
+        self.stdout.write(self.style.SUCCESS(f"Warmed up in {total:.1f} ms."))
+
+    def describe(self, step, result):
+        if step == "url resolvers":
+            return f"namespaces {', '.join(result)}"
+        if step == "templates":
+            compiled, failed = result
+            return f"{compiled} compiled" + (f", failed: {', '.join(failed)}" if failed else "")
+        if step == "database connections":
+            return ", ".join(result)
+        return ", ".join(f"{path} {status}" for path, status in result.items())
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.6 on 2026-10-19 19:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0001_initial"),
+    ]
+
+    operations = [
+        # Unrelated to related posts: 0001_initial was generated before
+        # Post.category got its default, and this brings the migration state
+        # in line with the model. Nothing changes in the database.
+        migrations.AlterField(
+            model_name="post",
+            name="category",
+            field=models.ForeignKey(
+                default="Uncategorized",
+                on_delete=django.db.models.deletion.PROTECT,
+                to="posts.category",
+            ),
+        ),
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_posts",
+                        to="posts.post",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="posts.post",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["post", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatedpost",
+            constraint=models.UniqueConstraint(
+                fields=("post", "rank"), name="unique_related_post_rank"
+            ),
+        ),
+    ]
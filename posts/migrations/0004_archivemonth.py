@@ -0,0 +1,49 @@
+# Generated by Django 4.2.6 on 2026-10-19 19:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0003_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchiveMonth",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                ("post_count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["created_at"], name="post_created_at_idx"),
+        ),
+        migrations.AddField(
+            model_name="archivemonth",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archive_months",
+                to="posts.category",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="archivemonth",
+            constraint=models.UniqueConstraint(
+                fields=("category", "year", "month"), name="unique_archive_month"
+            ),
+        ),
+    ]
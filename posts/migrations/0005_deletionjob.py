@@ -0,0 +1,48 @@
+# Generated by Django 4.2.6 on 2026-10-19 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0004_archivemonth"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletionJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("user", "User"), ("category", "Category")],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("posts_deleted", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddConstraint(
+            model_name="deletionjob",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="unique_deletion_job"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.6 on 2026-10-19 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0006_post_search"),
+    ]
+
+    # The FileField stores the same values as the CloudinaryField it replaces,
+    # so only the migration state changes. A real AlterField would rebuild
+    # posts_post on SQLite and drop the search triggers of 0006_post_search.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="post",
+                    name="image",
+                    field=models.FileField(
+                        blank=True,
+                        max_length=255,
+                        null=True,
+                        upload_to="images/",
+                        verbose_name="image",
+                    ),
+                ),
+            ],
+        ),
+    ]
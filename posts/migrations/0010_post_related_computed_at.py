@@ -0,0 +1,34 @@
+# Generated by Django 4.2.6 on 2026-10-19 21:05
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def set_related_computed_at(apps, schema_editor):
+    # Posts that already have related posts keep them until they are edited.
+    Post = apps.get_model("posts", "Post")
+    RelatedPost = apps.get_model("posts", "RelatedPost")
+    computed_at = (
+        RelatedPost.objects.filter(post=OuterRef("pk"))
+        .values("post")
+        .annotate(computed_at=Max("computed_at"))
+        .values("computed_at")
+    )
+    Post.objects.update(related_computed_at=Subquery(computed_at))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0009_timelines"),
+    ]
+
+    # A nullable column without a default is added with ALTER TABLE on
+    # SQLite, so the search triggers of 0006_post_search are kept.
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="related_computed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(set_related_computed_at, migrations.RunPython.noop),
+    ]
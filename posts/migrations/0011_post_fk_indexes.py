@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+FIELDS = ["category", "author"]
+
+
+def _column_indexes(schema_editor, table, column):
+    """
+    Returns the names of the plain (non-unique) indexes on just `column`.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        constraints = schema_editor.connection.introspection.get_constraints(cursor, table)
+    return [
+        name
+        for name, constraint in constraints.items()
+        if constraint["index"] and not constraint["unique"] and constraint["columns"] == [column]
+    ]
+
+
+def drop_fk_indexes(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    table = Post._meta.db_table
+    for name in FIELDS:
+        for index in _column_indexes(schema_editor, table, Post._meta.get_field(name).column):
+            schema_editor.execute(
+                schema_editor.sql_delete_index
+                % {"table": schema_editor.quote_name(table), "name": schema_editor.quote_name(index)}
+            )
+
+
+def create_fk_indexes(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    for name in FIELDS:
+        if not _column_indexes(schema_editor, Post._meta.db_table, Post._meta.get_field(name).column):
+            schema_editor.add_index(Post, models.Index(fields=[name], name=f"post_{name}_id_idx"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0010_post_related_computed_at"),
+    ]
+
+    # The single-column foreign key indexes are prefixes of the composite
+    # indexes of 0008_query_plan_indexes and 0009_timelines. They are dropped
+    # directly: an AlterField would rebuild posts_post on SQLite and drop the
+    # search triggers of 0006_post_search.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="post",
+                    name="category",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        default="Uncategorized",
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="posts.category",
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="post",
+                    name="author",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_fk_indexes, create_fk_indexes),
+            ],
+        ),
+    ]
@@ -1,31 +1,224 @@
 from django.db import models
 from django.contrib.auth import get_user
-
-from cloudinary.models import CloudinaryField
+from django.utils.text import slugify
 
 from users.models import User
 
 
 class Category(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    # Cleared as soon as the category is scheduled for deletion, see posts.deletion.
+    is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Active categories, newest first (home page and category list).
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='category_active_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    slug = models.SlugField(max_length=50, unique=True)
+    # Kept up to date by the m2m_changed / post_delete handlers in posts.signals,
+    # so the tag cloud never has to count PostTag rows.
+    post_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-post_count'], name='tag_post_count_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class PostQuerySet(models.QuerySet):
+    def visible(self):
+        """
+        Leaves out the posts of deactivated accounts and hidden categories,
+        which are waiting for posts.deletion to remove them.
+        """
+        return self.filter(author__is_active=True, category__is_active=True)
+
+    def tagged(self, tags):
+        """
+        Returns the posts carrying every one of `tags`.
+
+        Each tag adds a join on the (tag, post) index of PostTag. The rarest tag
+        is joined first so the other tags only have to be probed for its posts.
+        """
+        queryset = self
+        for tag in sorted(tags, key=lambda tag: tag.post_count):
+            queryset = queryset.filter(tags=tag)
+        return queryset
+
+
 class Post(models.Model):
     title = models.CharField(max_length=255, unique=True)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
-    category = models.ForeignKey(Category, on_delete=models.PROTECT, default='Uncategorized')
-    author = models.ForeignKey(User, on_delete=models.CASCADE)
-    image = CloudinaryField("image", blank=True, null=True)
+    # Both covered by the (category, created_at) and (author, created_at, id)
+    # indexes below.
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, default='Uncategorized', db_index=False)
+    author = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    image = models.FileField("image", upload_to="images/", max_length=255, blank=True, null=True)
+    tags = models.ManyToManyField(Tag, through='PostTag', related_name='posts', blank=True)
+    # Set by compute_related_posts, cleared when one of the related posts is
+    # deleted; posts without a value (or edited since) are recomputed.
+    related_computed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='post_created_at_idx'),
+            # Newest posts of a category and of an author; id breaks ties for
+            # the keyset pagination of the feed.
+            models.Index(fields=['category', '-created_at'], name='post_category_created_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+
+class PostTag(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # Covered by the (tag, post) constraint index below.
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'post'], name='unique_post_tag'),
+        ]
+
+    def __str__(self):
+        return f'{self.post} - {self.tag}'
+
+
+class RelatedPost(models.Model):
+    """
+    A precomputed "related posts" entry, written by the compute_related_posts
+    management command and read by PostDetailView.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_posts')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['post', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'rank'], name='unique_related_post_rank'),
+        ]
+
+    def __str__(self):
+        return f'{self.post} -> {self.related}'
+
+
+class ArchiveMonth(models.Model):
+    """
+    Number of posts per category and calendar month, so that the archive
+    navigation never has to aggregate over Post.
+
+    Maintained by the handlers in posts.signals and rebuilt from scratch by
+    the rebuild_archive management command.
+    """
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='archive_months')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'year', 'month'], name='unique_archive_month'),
+        ]
+
+    def __str__(self):
+        return f'{self.category} {self.year}-{self.month:02d}: {self.post_count}'
+
+
+class DeletionJob(models.Model):
+    """
+    A user account or category waiting to be deleted by the process_deletions
+    management command.
+
+    Its posts are removed in small batches, each in its own transaction, and
+    the account or category itself goes last. A crashed worker simply picks
+    the job up again, since whatever posts are left are the remaining work.
+    """
+    USER = 'user'
+    CATEGORY = 'category'
+    KIND_CHOICES = [
+        (USER, 'User'),
+        (CATEGORY, 'Category'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    posts_deleted = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_deletion_job'),
+        ]
+
+    def __str__(self):
+        return f'Delete {self.kind} {self.object_id}'
+
+
+class TimelineEntry(models.Model):
+    """
+    A post in the feed of one of its author's followers, written by the
+    fan-out worker (see posts.feed). created_at is copied from the post so
+    the feed is read from the (user, created_at, post) index alone.
+    """
+    # Covered by the (user, post) constraint and the feed index below.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_timeline_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='timeline_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post} for {self.user}'
+
+
+class FanOutJob(models.Model):
+    """
+    A new post being copied to its author's followers' timelines, in batches
+    of followers ordered by id.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name='+')
+    last_follower_id = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Fan out {self.post}'
+
+
 class Comment(models.Model):
     pass
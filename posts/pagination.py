@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(created_at, pk):
+    """
+    Encodes a (created_at, pk) position as an opaque string.
+    """
+    delta = created_at - EPOCH
+    microseconds = (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+    return f'{microseconds}-{pk}'
+
+
+def decode_cursor(cursor):
+    """
+    Returns the (created_at, pk) position encoded in `cursor`, or None if the
+    cursor is malformed.
+    """
+    try:
+        microseconds, pk = (int(part) for part in cursor.split('-'))
+        return EPOCH + timedelta(microseconds=microseconds), pk
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def after_cursor(queryset, cursor=None, pk='pk'):
+    """
+    Orders `queryset` newest first and, given a cursor, starts it right after
+    that position. Works for model and .values() querysets alike.
+
+    `pk` names the field that breaks ties between equal created_at values.
+    """
+    queryset = queryset.order_by('-created_at', f'-{pk}')
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, last_pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, **{f'{pk}__lt': last_pk})
+        )
+    return queryset
+
+
+def keyset_page(queryset, cursor=None, per_page=20):
+    """
+    Returns one page of `queryset`, newest first, and the cursor of the next
+    page (None on the last page).
+
+    Unlike OFFSET pagination, every page is a range scan that starts right
+    after the previous one, so deep pages cost the same as the first.
+    """
+    items = list(after_cursor(queryset, cursor)[:per_page + 1])
+    if len(items) <= per_page:
+        return items, None
+    last = items[per_page - 1]
+    return items[:per_page], encode_cursor(last.created_at, last.pk)
@@ -0,0 +1,28 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# SQLite FTS5 index over Post.title and Post.content, created and kept in
+# sync by triggers in migration 0006_post_search.
+POST_SEARCH_TABLE = 'posts_post_fts'
+
+
+def search_posts(queryset, term):
+    """
+    Filters `queryset` down to the posts whose title or content contain every
+    word of `term` (as a word prefix).
+
+    On SQLite this is answered by the full-text index; other databases fall
+    back to a LIKE scan.
+    """
+    words = term.split()
+    if not words:
+        return queryset
+    if connection.vendor != 'sqlite':
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(content__icontains=word))
+        return queryset
+    match = ' '.join('"%s"*' % word.replace('"', '""') for word in words)
+    return queryset.filter(
+        pk__in=RawSQL(f'SELECT rowid FROM {POST_SEARCH_TABLE} WHERE {POST_SEARCH_TABLE} MATCH %s', [match])
+    )
@@ -0,0 +1,91 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .archive import adjust_archive_month
+from .feed import schedule_fan_out
+from .models import Post, RelatedPost
+from .tags import increment_tag_counts, recount_tags
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keeps Tag.post_count in sync when tags are added to or removed from posts.
+    """
+    if action == 'pre_clear':
+        # pk_set is not provided for clear(), so remember the affected tags.
+        instance._cleared_tag_ids = (
+            [instance.pk] if reverse else list(instance.tags.values_list('pk', flat=True))
+        )
+    elif action == 'post_clear':
+        recount_tags(getattr(instance, '_cleared_tag_ids', []))
+    elif action == 'post_add':
+        # pk_set only holds the rows that were actually inserted.
+        if reverse:
+            increment_tag_counts([instance.pk], len(pk_set))
+        else:
+            increment_tag_counts(pk_set)
+    elif action == 'post_remove':
+        recount_tags([instance.pk] if reverse else pk_set)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_post_tags(sender, instance, **kwargs):
+    instance._deleted_tag_ids = list(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Post)
+def mark_related_posts_stale(sender, instance, **kwargs):
+    """
+    The posts listing `instance` as related lose that row with it; make
+    compute_related_posts fill the gap on its next run.
+    """
+    Post.objects.filter(
+        pk__in=RelatedPost.objects.filter(related=instance).values('post')
+    ).update(related_computed_at=None)
+
+
+@receiver(post_delete, sender=Post)
+def update_tag_counts_on_delete(sender, instance, **kwargs):
+    recount_tags(getattr(instance, '_deleted_tag_ids', []))
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_category(sender, instance, raw, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_category_id = (
+            Post.objects.filter(pk=instance.pk).values_list('category_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def update_archive_on_save(sender, instance, created, raw, **kwargs):
+    """
+    Keeps the ArchiveMonth rollup in sync when a post is created or moved to
+    another category.
+    """
+    if raw:
+        return
+    if created:
+        adjust_archive_month(instance.category_id, instance.created_at, 1)
+        return
+    previous_category_id = getattr(instance, '_previous_category_id', None)
+    if previous_category_id is not None and previous_category_id != instance.category_id:
+        adjust_archive_month(previous_category_id, instance.created_at, -1)
+        adjust_archive_month(instance.category_id, instance.created_at, 1)
+    instance._previous_category_id = instance.category_id
+
+
+@receiver(post_save, sender=Post)
+def fan_out_on_create(sender, instance, created, raw, **kwargs):
+    """
+    Queues new posts for the process_fan_out worker, which copies them to the
+    followers' timelines.
+    """
+    if created and not raw:
+        schedule_fan_out(instance)
+
+
+@receiver(post_delete, sender=Post)
+def update_archive_on_delete(sender, instance, **kwargs):
+    adjust_archive_month(instance.category_id, instance.created_at, -1)
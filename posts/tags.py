@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import PostTag, Tag
+
+TAG_CLOUD_CACHE_KEY = 'posts:tag-cloud'
+TAG_CLOUD_SIZE = 30
+TAG_CLOUD_TIMEOUT = 60 * 60
+
+
+def _drop_tag_cloud():
+    transaction.on_commit(lambda: cache.delete(TAG_CLOUD_CACHE_KEY))
+
+
+def increment_tag_counts(tag_ids, amount=1):
+    """
+    Adds `amount` to Tag.post_count of the given tags and drops the cached
+    tag cloud. Used when tags are added to posts.
+    """
+    tag_ids = list(tag_ids)
+    if not tag_ids:
+        return
+    Tag.objects.filter(pk__in=tag_ids).update(post_count=F('post_count') + amount)
+    _drop_tag_cloud()
+
+
+def recount_tags(tag_ids):
+    """
+    Refreshes Tag.post_count for the given tags from PostTag and drops the
+    cached tag cloud. Used when posts lose tags, where the removed rows are
+    not always known.
+
+    Each count reads the tag's range of the (tag, post) index, so its cost
+    grows with the number of posts carrying the tag.
+    """
+    tag_ids = list(tag_ids)
+    if not tag_ids:
+        return
+    count = (
+        PostTag.objects.filter(tag=OuterRef('pk'))
+        .values('tag')
+        .annotate(n=Count('post'))
+        .values('n')
+    )
+    Tag.objects.filter(pk__in=tag_ids).update(post_count=Coalesce(Subquery(count), 0))
+    _drop_tag_cloud()
+
+
+def get_tag_cloud():
+    """
+    Returns the most used tags as a list of dicts with name, slug and post_count.
+    """
+    return cache.get_or_set(
+        TAG_CLOUD_CACHE_KEY,
+        lambda: list(
+            Tag.objects.filter(post_count__gt=0)
+            .order_by('-post_count')
+            .values('name', 'slug', 'post_count')[:TAG_CLOUD_SIZE]
+        ),
+        TAG_CLOUD_TIMEOUT,
+    )
@@ -0,0 +1,38 @@
+"""
+Test data shared by the test modules of several apps.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import Category, Post
+
+
+def seed_posts(categories=20, authors=10, posts=2000):
+    """
+    Creates active and inactive categories, authors and posts spread over
+    them, newest last.
+    """
+    categories = Category.objects.bulk_create(
+        Category(name=f'Category {i}', is_active=i % 4 != 0) for i in range(categories)
+    )
+    authors = [
+        get_user_model().objects.create_user(email=f'author{i}@example.com', password='password')
+        for i in range(authors)
+    ]
+    posts = Post.objects.bulk_create(
+        Post(
+            title=f'Post {i}',
+            content='Lorem ipsum',
+            category=categories[i % len(categories)],
+            author=authors[i % len(authors)],
+        )
+        for i in range(posts)
+    )
+    # created_at is auto_now_add, so spread the dates out afterwards.
+    start = timezone.now() - timedelta(days=len(posts))
+    for i, post in enumerate(posts):
+        post.created_at = start + timedelta(days=i)
+    Post.objects.bulk_update(posts, ['created_at'], batch_size=500)
+    return categories, authors
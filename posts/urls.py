@@ -6,6 +6,9 @@ app_name = 'posts'
 urlpatterns = [
     path('', views.HomeView.as_view(), name='home'),
     path('all', views.PostListView.as_view(), name='post-list'),
+    path('feed/', views.FeedView.as_view(), name='feed'),
+    path('archive/<int:year>/', views.PostArchiveView.as_view(), name='archive-year'),
+    path('archive/<int:year>/<int:month>/', views.PostArchiveView.as_view(), name='archive-month'),
     path('post/<int:pk>/', views.PostDetailView.as_view(), name='post-detail'),
     path('post-delete/<int:pk>/', views.PostDeleteView.as_view(), name='post-delete'),
     path('post-create/', views.PostCreateView.as_view(), name='post-create'),
@@ -15,4 +18,6 @@ urlpatterns = [
     path('categories/', views.CategoryList.as_view(), name='category-list'),
     path('category-delete/<int:pk>/', views.CategoryDeleteView.as_view(), name='category-delete'),
     # path('category-create/', views.CategoryCreateView.as_view(), name='category-create'),
+
+    path('tag/<str:slugs>/', views.TagDetailView.as_view(), name='tag-detail'),
 ]
\ No newline at end of file
@@ -3,20 +3,28 @@ from django.forms.models import BaseModelForm
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.http import Http404, HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 from django.contrib import messages
 
-from .models import Post, Category
+from .archive import get_archive_months, month_range
+from .deletion import schedule_category_deletion
+from .feed import feed_page
+from .models import Post, Category, RelatedPost, Tag
+from .pagination import keyset_page
+from .tags import get_tag_cloud
 
 class HomeView(TemplateView):
     template_name = 'posts/home.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['posts'] = Post.objects.order_by('-created_at')[:3]
-        context['categories'] = Category.objects.order_by('-created_at')[:3]
+        context['posts'] = Post.objects.visible().order_by('-created_at')[:3]
+        context['categories'] = Category.objects.filter(is_active=True).order_by('-created_at')[:3]
+        context['tag_cloud'] = get_tag_cloud()
+        context['archive_months'] = get_archive_months()
         return context
 
 class PostListView(ListView):
@@ -29,11 +37,55 @@ class PostListView(ListView):
         context_object_name (str): The name of the context variable to use in the template.
         ordering (str): The field to use when ordering the queryset.
     """
-    model = Post
+    queryset = Post.objects.visible()
     template_name = 'posts/post_list.html'
     context_object_name = 'posts'
     ordering = ['-created_at']
 
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['archive_months'] = get_archive_months()
+        return context
+
+class PostArchiveView(TemplateView):
+    """
+    A view that displays the posts of a year, or of a month when one is given
+    in the URL, with keyset pagination through the `before` query parameter.
+
+    The sidebar month counts come from the ArchiveMonth rollup.
+    """
+    template_name = 'posts/archive.html'
+    paginate_by = 20
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        year, month = self.kwargs['year'], self.kwargs.get('month')
+        if not 1 <= year <= 9998 or (month is not None and not 1 <= month <= 12):
+            raise Http404('Invalid date.')
+        start, end = month_range(year, month)
+        queryset = Post.objects.visible().filter(created_at__gte=start, created_at__lt=end).select_related('author')
+        context['posts'], context['next_cursor'] = keyset_page(
+            queryset, self.request.GET.get('before'), self.paginate_by
+        )
+        context['period'] = start
+        context['archive_months'] = get_archive_months()
+        return context
+
+class FeedView(LoginRequiredMixin, TemplateView):
+    """
+    A view that displays the posts of the authors the current user follows,
+    with keyset pagination through the `before` query parameter.
+    """
+    template_name = 'posts/feed.html'
+    paginate_by = 20
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['posts'], context['next_cursor'] = feed_page(
+            self.request.user, self.request.GET.get('before'), self.paginate_by
+        )
+        return context
+
 class PostDetailView(DetailView):
     """
     A view that displays the details of a single blog post.
@@ -43,10 +95,23 @@ class PostDetailView(DetailView):
         template_name (str): The name of the template that will be used to render the view.
         context_object_name (str): The name of the variable that will be used to store the post data in the template context.
     """
-    model = Post
+    queryset = Post.objects.visible()
     template_name = 'posts/post_detail.html'
     context_object_name = 'post'
 
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        """
+        Adds the related posts precomputed by the compute_related_posts command,
+        leaving out the hidden ones.
+        """
+        context = super().get_context_data(**kwargs)
+        context['related_posts'] = (
+            RelatedPost.objects.filter(
+                post=self.object, related__author__is_active=True, related__category__is_active=True
+            ).select_related('related').order_by('rank')
+        )
+        return context
+
 @method_decorator(csrf_exempt, name="dispatch")
 class PostCreateView(LoginRequiredMixin, CreateView):
     """
@@ -58,7 +123,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
     """
     model = Post
     template_name = 'posts/post_form.html'
-    fields = ['title', 'content', 'image', 'category']
+    fields = ['title', 'content', 'image', 'category', 'tags']
 
     def form_valid(self, form):
         """
@@ -106,7 +171,7 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
         template_name (str): The name of the template used for rendering the form.
     """
     model = Post
-    fields = ['title', 'content', 'image', 'category']
+    fields = ['title', 'content', 'image', 'category', 'tags']
     context_object_name = 'post'
     template_name = 'posts/post_update.html'
 
@@ -169,35 +234,74 @@ class PostDeleteView(DeleteView):
         return context
 
 class CategoryList(ListView):
-    model = Category
+    queryset = Category.objects.filter(is_active=True)
     template_name = 'posts/category_list.html'
     context_object_name = 'categories'
     ordering = ['-created_at']
     
 class CategoryDetailView(DetailView):
-    model = Category
+    queryset = Category.objects.filter(is_active=True)
     template_name = 'posts/category_detail.html'
     context_object_name = 'category'
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context['posts'] = Post.objects.filter(category=context['category'].pk)
-        print(context['posts'])
-        return super().get_context_data(**kwargs)
+        context['posts'] = Post.objects.visible().filter(category=context['category'].pk).order_by('-created_at')
+        return context
 
-class CategoryDeleteView(DeleteView):
+class TagDetailView(ListView):
     """
-    View for deleting a blog post.
+    A view that displays the posts carrying all of the tags in the URL.
+
+    Tags are given as slugs joined with "+", e.g. /posts/tag/django+orm/.
+    """
+    template_name = 'posts/tag_detail.html'
+    context_object_name = 'posts'
+
+    def get_tags(self):
+        slugs = set(self.kwargs['slugs'].split('+'))
+        tags = list(Tag.objects.filter(slug__in=slugs))
+        if len(tags) != len(slugs):
+            raise Http404('No such tag.')
+        return tags
+
+    def get_queryset(self):
+        self.tags = self.get_tags()
+        return Post.objects.tagged(self.tags).visible().select_related('author').order_by('-created_at')
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['tags'] = self.tags
+        selected = {tag.slug for tag in self.tags}
+        context['narrow_tags'] = [
+            dict(tag, slugs=f"{self.kwargs['slugs']}+{tag['slug']}")
+            for tag in get_tag_cloud() if tag['slug'] not in selected
+        ]
+        return context
+
+class CategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+    """
+    View for deleting a category together with its posts, restricted to users
+    with the delete_category permission.
+
+    The category is hidden right away and queued for deletion; its posts are
+    removed in batches by the process_deletions management command.
 
     Attributes:
-        model (Post): The model used for deleting the post.
+        model (Category): The model used for deleting the category.
         template_name (str): The name of the template used for rendering the confirmation form.
     """
     model = Category
+    permission_required = 'posts.delete_category'
     template_name = 'posts/confirm_delete.html'
 
     def get_success_url(self):
-        return reverse_lazy('category-list')
+        return reverse_lazy('posts:category-list')
+
+    def form_valid(self, form):
+        schedule_category_deletion(self.object)
+        messages.success(self.request, 'Category scheduled for deletion.')
+        return HttpResponseRedirect(self.get_success_url())
     
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
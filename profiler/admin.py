@@ -0,0 +1,42 @@
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import ProfileCapture
+
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'method', 'path', 'mode', 'status_code', 'duration_ms', 'query_count', 'user', 'report_link']
+    list_select_related = ['user']
+    list_filter = ['mode']
+    exclude = ['report']
+    readonly_fields = ['report_link']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/report/',
+                self.admin_site.admin_view(self.report_view),
+                name='profiler_profilecapture_report',
+            ),
+        ] + super().get_urls()
+
+    def report_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        capture = get_object_or_404(ProfileCapture, pk=pk)
+        return HttpResponse(capture.report)
+
+    @admin.display(description='Report')
+    def report_link(self, obj):
+        return format_html('<a href="{}">View report</a>', reverse('admin:profiler_profilecapture_report', args=[obj.pk]))
@@ -0,0 +1,151 @@
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+PROJECT_DIR = str(Path(settings.BASE_DIR).resolve())
+
+
+def _is_project_file(filename):
+    return filename.startswith(PROJECT_DIR) and 'site-packages' not in filename
+
+
+def _short_name(filename):
+    if filename.startswith(PROJECT_DIR):
+        return filename[len(PROJECT_DIR) + 1:]
+    for marker in ('site-packages/', 'lib/python'):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+class QueryRecorder:
+    """
+    A database execute wrapper recording each query with its duration and the
+    project frames it was issued from.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            origin = [
+                f'{_short_name(frame.filename)}:{frame.lineno} in {frame.name}'
+                for frame in traceback.extract_stack()[:-1]
+                if _is_project_file(frame.filename)
+            ]
+            self.queries.append({'sql': sql, 'duration_ms': duration, 'origin': origin[-6:]})
+
+
+class CProfileCollector:
+    """
+    Runs the request under cProfile and reports the functions with the highest
+    cumulative time.
+    """
+    mode = 'cprofile'
+
+    def __init__(self, limit=60):
+        self.limit = limit
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+
+    def rows(self):
+        stats = pstats.Stats(self.profile, stream=io.StringIO())
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        rows = []
+        for func in stats.fcn_list[:self.limit]:
+            primitive_calls, calls, total_time, cumulative_time, _ = stats.stats[func]
+            filename, lineno, name = func
+            rows.append({
+                'function': f'{name} ({_short_name(filename)}:{lineno})' if lineno else name,
+                'calls': calls if calls == primitive_calls else f'{calls}/{primitive_calls}',
+                'total_ms': total_time * 1000,
+                'cumulative_ms': cumulative_time * 1000,
+            })
+        return rows
+
+
+class SamplingCollector:
+    """
+    Samples the stack of the profiled thread from a background thread and
+    lays the collapsed stacks out as a flame graph.
+    """
+    mode = 'sample'
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        # Stacks are cut at the frame that started profiling.
+        self._root = sys._getframe(1)
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None and frame is not self._root:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({_short_name(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def flame_graph(self, min_width=0.2):
+        """
+        Returns the flame graph as a list of boxes with their depth, horizontal
+        offset and width (both in percent of all samples). Boxes narrower than
+        `min_width` percent are dropped.
+        """
+        total = sum(self.stacks.values())
+        if not total:
+            return []
+        tree = {}
+        for stack, count in self.stacks.items():
+            node = tree
+            for name in stack:
+                entry = node.setdefault(name, [0, {}])
+                entry[0] += count
+                node = entry[1]
+
+        boxes = []
+
+        def layout(node, depth, offset):
+            for name, (count, children) in sorted(node.items()):
+                width = count * 100 / total
+                if width >= min_width:
+                    boxes.append({
+                        'name': name, 'depth': depth, 'offset': offset,
+                        'width': width, 'samples': count,
+                    })
+                    layout(children, depth + 1, offset)
+                offset += width
+
+        layout(tree, 0, 0)
+        return boxes
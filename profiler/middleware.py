@@ -0,0 +1,85 @@
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve, reverse
+
+from .collectors import CProfileCollector, QueryRecorder, SamplingCollector
+from .models import ProfileCapture
+
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILED_NAMESPACES = {'posts', 'users'}
+COLLECTORS = {
+    CProfileCollector.mode: CProfileCollector,
+    SamplingCollector.mode: SamplingCollector,
+}
+
+
+class ProfilerMiddleware:
+    """
+    Profiles a request when a staff user asks for it with `?_profile=` or an
+    `X-Profile:` header, set to "cprofile" (the default) or "sample".
+
+    The report (profile plus every SQL query with the code that issued it) is
+    stored as a ProfileCapture and listed in the admin. Requests that do not
+    ask for a profile only pay for the two dictionary lookups below.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # An empty `?_profile=` asks for the default mode.
+        mode = request.GET[PROFILE_PARAM] if PROFILE_PARAM in request.GET else request.META.get(PROFILE_HEADER)
+        if mode is None or not self.should_profile(request):
+            return self.get_response(request)
+        return self.profile(request, COLLECTORS.get(mode, CProfileCollector)())
+
+    def should_profile(self, request):
+        if not request.user.is_staff:
+            return False
+        try:
+            return resolve(request.path_info).namespace in PROFILED_NAMESPACES
+        except Resolver404:
+            return False
+
+    def profile(self, request, collector):
+        queries = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries), collector:
+            response = self.get_response(request)
+        duration = (time.perf_counter() - start) * 1000
+
+        query_ms = sum(query['duration_ms'] for query in queries.queries)
+        context = {
+            'request_path': request.get_full_path(),
+            'mode': collector.mode,
+            'duration_ms': duration,
+            'queries': sorted(queries.queries, key=lambda query: -query['duration_ms']),
+            'query_ms': query_ms,
+        }
+        if collector.mode == SamplingCollector.mode:
+            context['boxes'] = collector.flame_graph()
+            context['depth'] = max((box['depth'] for box in context['boxes']), default=-1) + 1
+        else:
+            context['rows'] = collector.rows()
+
+        capture = ProfileCapture.objects.create(
+            path=request.get_full_path()[:2000],
+            method=request.method,
+            mode=collector.mode,
+            user=request.user,
+            status_code=response.status_code,
+            duration_ms=duration,
+            query_count=len(queries.queries),
+            query_ms=query_ms,
+            report=render_to_string('profiler/report.html', context),
+        )
+        keep = getattr(settings, 'PROFILER_MAX_CAPTURES', 50)
+        stale = ProfileCapture.objects.order_by('-pk').values_list('pk', flat=True)[keep:]
+        ProfileCapture.objects.filter(pk__in=list(stale)).delete()
+
+        response['X-Profile-Capture'] = reverse('admin:profiler_profilecapture_report', args=[capture.pk])
+        return response
@@ -0,0 +1,25 @@
+from django.db import models
+
+from users.models import User
+
+
+class ProfileCapture(models.Model):
+    """
+    The report of one profiled request, see profiler.middleware.
+    """
+    path = models.CharField(max_length=2000)
+    method = models.CharField(max_length=10)
+    mode = models.CharField(max_length=10)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_ms = models.FloatField()
+    report = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.method} {self.path} ({self.duration_ms:.0f} ms)'
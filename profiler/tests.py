@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Category, Post
+
+from .models import ProfileCapture
+
+
+class ProfilerMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.staff = User.objects.create_user(email='staff@example.com', password='password', is_staff=True)
+        cls.user = User.objects.create_user(email='user@example.com', password='password')
+        category = Category.objects.create(name='News')
+        Post.objects.create(title='Profiled', content='Content', category=category, author=cls.staff)
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('posts:post-list'), {'_profile': ''})
+        self.assertEqual(response.status_code, 200)
+        capture = ProfileCapture.objects.get()
+        self.assertEqual(response['X-Profile-Capture'], reverse('admin:profiler_profilecapture_report', args=[capture.pk]))
+        self.assertEqual((capture.mode, capture.user, capture.status_code), ('cprofile', self.staff, 200))
+        self.assertGreater(capture.query_count, 0)
+
+    def test_header_selects_the_mode(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('posts:post-list'), headers={'X-Profile': 'sample'})
+        self.assertIn('X-Profile-Capture', response)
+        self.assertEqual(ProfileCapture.objects.get().mode, 'sample')
+
+    def test_non_staff_request_is_not_profiled(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('posts:post-list'), {'_profile': 'cprofile'})
+        self.assertNotIn('X-Profile-Capture', response)
+        self.assertFalse(ProfileCapture.objects.exists())
+
+    def test_request_outside_the_profiled_namespaces_is_not_profiled(self):
+        self.client.force_login(self.staff)
+        for path in (reverse('api:post-list'), '/not-routed/'):
+            response = self.client.get(path, {'_profile': 'cprofile'})
+            self.assertNotIn('X-Profile-Capture', response)
+        self.assertFalse(ProfileCapture.objects.exists())
+
+    def test_report_requires_view_permission(self):
+        capture = ProfileCapture.objects.create(
+            path='/posts/', method='GET', mode='cprofile', user=self.staff, status_code=200,
+            duration_ms=1, query_count=1, query_ms=1, report='<p>report</p>',
+        )
+        url = reverse('admin:profiler_profilecapture_report', args=[capture.pk])
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.staff.user_permissions.add(Permission.objects.get(codename='view_profilecapture'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'<p>report</p>')
@@ -1,5 +1,34 @@
 from django.contrib import admin
+from django.db.models import Q
+
+from blog.pagination import EstimatedCountPaginator
 
 from .models import User
 
-admin.site.register(User)
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    list_display = ["email", "first_name", "last_name", "is_active", "is_staff", "date_joined"]
+    list_filter = ["is_active", "is_staff"]
+    # Newest first through the primary key rather than an unindexed sort
+    # on date_joined.
+    ordering = ["-pk"]
+    search_fields = ["email", "username"]
+    search_help_text = "Start of an email address or username."
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # Prefix matches written as ranges, so that they are answered by the
+        # unique indexes on email and username instead of an icontains scan.
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        upper = search_term + "\U0010ffff"
+        return (
+            queryset.filter(
+                Q(email__gte=search_term, email__lt=upper)
+                | Q(username__gte=search_term, username__lt=upper)
+            ),
+            False,
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.6 on 2026-10-19 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    # The FileField stores the same values as the CloudinaryField it replaces,
+    # so only the migration state changes.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="user",
+                    name="avatar",
+                    field=models.FileField(
+                        blank=True,
+                        max_length=255,
+                        null=True,
+                        upload_to="avatars/",
+                        verbose_name="avatar",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+# posts.feed.PULL_FOLLOWER_THRESHOLD when this migration was written.
+PULL_FOLLOWER_THRESHOLD = 10000
+
+
+def flag_pull_authors(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    User.objects.filter(follower_count__gt=PULL_FOLLOWER_THRESHOLD).update(is_pull_author=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0003_follow"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="is_pull_author",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(flag_pull_authors, migrations.RunPython.noop),
+    ]
@@ -6,7 +6,6 @@ from django.contrib.auth.models import (
     Group,
     Permission,
 )
-from cloudinary.models import CloudinaryField
 
 
 class CustomUserManager(BaseUserManager):
@@ -70,13 +69,20 @@ class User(AbstractUser, PermissionsMixin):
     username = models.CharField(max_length=30, unique=True, blank=True, null=True)
     first_name = models.CharField(max_length=30)
     last_name = models.CharField(max_length=30)
-    avatar = CloudinaryField("avatar", blank=True, null=True)
+    avatar = models.FileField("avatar", upload_to="avatars/", max_length=255, blank=True, null=True)
     date_joined = models.DateTimeField(auto_now_add=True)
     last_login = models.DateTimeField(auto_now=True)
     date_modified = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
+    # Kept up to date by posts.feed.follow() / unfollow(); decides whether new
+    # posts are pushed to the followers' timelines or pulled when reading them.
+    follower_count = models.PositiveIntegerField(default=0)
+    # Set by posts.feed.follow() once follower_count passes the pull threshold
+    # and never cleared: the posts made since were not pushed to timelines, so
+    # they have to keep being pulled even if followers leave.
+    is_pull_author = models.BooleanField(default=False, editable=False)
     groups = models.ManyToManyField(
         Group,
         verbose_name="groups",
@@ -111,3 +117,18 @@ class User(AbstractUser, PermissionsMixin):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-date_joined"]
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(User, on_delete=models.CASCADE, related_name="following")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="followers")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Author first: fan-out walks an author's followers in follower order.
+            models.UniqueConstraint(fields=["author", "follower"], name="unique_follow"),
+        ]
+
+    def __str__(self):
+        return f"{self.follower} follows {self.author}"
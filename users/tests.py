@@ -1,3 +1,22 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from blog.query_plans import QueryPlanTestMixin
+from posts.testing import seed_posts
+
+
+class ProfileQueryPlanTests(QueryPlanTestMixin, TestCase):
+    """
+    Checks that the posts on a profile page are read through an index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.authors = seed_posts()
+        cls.analyze()
+
+    def test_profile_posts(self):
+        author = self.authors[0]
+        self.client.force_login(author)
+        response = self.client.get(reverse("users:user-profile", kwargs={"pk": author.pk}))
+        self.assertIndexed(response.context["posts"])
@@ -10,6 +10,8 @@ urlpatterns = [
     path("logout/", views.CustomLogout.as_view(next_page="posts:home"), name="logout"),
     path("signup/", views.SignUpView.as_view(), name="signup"),
     path("user-profile/<int:pk>", views.UserProfile.as_view(), name="user-profile"),
+    path("follow/<int:pk>/", views.FollowView.as_view(), name="follow"),
+    path("unfollow/<int:pk>/", views.FollowView.as_view(unfollow=True), name="unfollow"),
     path(
         "update-profile/<int:pk>/", views.UpdateProfile.as_view(), name="update-profile"
     ),
@@ -1,15 +1,21 @@
 from typing import Any
 from django.contrib.auth.views import LoginView, LogoutView
-from django.contrib.auth import login, authenticate, get_user_model
+from django.contrib.auth import login, logout, authenticate, get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.views import View
 from django.views.generic import CreateView, DetailView, DeleteView, UpdateView
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
+from posts.deletion import schedule_user_deletion
+from posts.feed import follow, unfollow
 
 from .forms import CustomSignUpForm
+from .models import Follow
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -98,17 +104,41 @@ class UserProfile(DetailView):
 
     def get_object(self):
         if self.kwargs.get("pk"):
-            return get_object_or_404(get_user_model(), pk=self.kwargs["pk"])
+            # Accounts queued for deletion are hidden right away.
+            return get_object_or_404(get_user_model(), pk=self.kwargs["pk"], is_active=True)
         else:
             return self.request.user
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["user"] = self.get_object()
-        context["posts"] = context["user"].post_set.all()
+        context["posts"] = context["user"].post_set.order_by("-created_at")
+        context["is_following"] = (
+            self.request.user.is_authenticated
+            and Follow.objects.filter(follower=self.request.user, author=context["user"]).exists()
+        )
         return context
 
 
+class FollowView(LoginRequiredMixin, View):
+    """
+    Follows the user in the URL, or unfollows them when `unfollow` is set,
+    and goes back to their profile page.
+    """
+
+    http_method_names = ["post"]
+    unfollow = False
+
+    def post(self, request, pk):
+        author = get_object_or_404(get_user_model(), pk=pk, is_active=True)
+        if self.unfollow:
+            if unfollow(request.user, author):
+                messages.success(request, f"You no longer follow {author.get_full_name()}.")
+        elif follow(request.user, author):
+            messages.success(request, f"You now follow {author.get_full_name()}.")
+        return HttpResponseRedirect(reverse_lazy("users:user-profile", kwargs={"pk": author.pk}))
+
+
 class UpdateProfile(UpdateView):
     model = get_user_model()
     template_name = "users/update_profile.html"
@@ -122,6 +152,13 @@ class UpdateProfile(UpdateView):
 
 
 class DeleteProfile(DeleteView):
+    """
+    Deactivates the current user's account and logs them out.
+
+    The account and its posts are deleted in batches afterwards by the
+    process_deletions management command, so this request stays short.
+    """
+
     model = get_user_model()
     template_name = "posts/confirm_delete.html"
 
@@ -135,3 +172,9 @@ class DeleteProfile(DeleteView):
 
     def get_object(self, queryset=None) -> Any:
         return self.request.user
+
+    def form_valid(self, form):
+        schedule_user_deletion(self.object)
+        logout(self.request)
+        messages.success(self.request, "Your account has been deleted.")
+        return HttpResponseRedirect(self.get_success_url())